@@ -111,6 +111,7 @@ def create_agentcore_lambda_layer():
         "Agents/aws_architecture_agent.py",
         "Agents/pricing_funding_agent.py",
         "Agents/sow_drafting_agent.py",
+        "Agents/json_scan.py",
     ]
 
     for agent_file in agent_files:
@@ -6,20 +6,483 @@ AWS Architecture Agent - Complete Integration with Diagram Storage
 - Handles both custom and reference diagrams
 """
 
+import asyncio
+import atexit
 import boto3
+from boto3.s3.transfer import TransferConfig
+from boto3.exceptions import S3UploadFailedError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+import hashlib
 import json
+import logging
 import os
-from typing import Dict, List, Optional
-from datetime import datetime
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
 from mcp import StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import Tool as MCPTool
 from strands import Agent, tool
 from strands.models import BedrockModel
-from strands.tools.mcp import MCPClient
+from strands.tools.mcp import MCPAgentTool, MCPClient
 from dotenv import load_dotenv
 
+try:
+    from Agents.json_scan import find_json_object
+except ImportError:  # run as a script from Agents/
+    from json_scan import find_json_object
+
+# Optional: enables the semantic tier of the KB query cache
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: faster JSON encode/decode on the hot paths
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# MCP server launch commands (command + args fully determine the tool set)
+AWS_DOCS_MCP_ARGS = ["awslabs.aws-documentation-mcp-server@latest"]
+AWS_DIAGRAM_MCP_ARGS = [
+    "--with", "jschema-to-python",
+    "--with", "diagrams",
+    "--with", "graphviz",
+    "awslabs.aws-diagram-mcp-server@latest"
+]
+MCP_CACHE_DIR = Path("./.mcp_cache")
+
+# Shared by every boto3 client here: KB queries, embeddings and the parallel
+# diagram uploads can all be in flight at once, so size the pool for that.
+_CLIENT_CONFIG = Config(
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+
+# KB query cache: exact tier (lru_cache) + opt-in semantic tier (Titan embeddings)
+KB_EMBED_MODEL_ID = "amazon.titan-embed-text-v2:0"
+KB_SEMANTIC_THRESHOLD = 0.95
+KB_SEMANTIC_CACHE_SIZE = 128
+# Both tiers expire: approved architectures are added to the KB while running
+KB_CACHE_TTL_SECONDS = int(os.environ.get("KB_CACHE_TTL", "300"))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# KB annotation fields
+_IMG_URI_RE = re.compile(r'(?:IMAGE_URI|REFERENCE_IMAGE):\s*(s3://\S+)')
+_TITLE_RE = re.compile(r'Title:\s*([^\n]+)')
+ANNOTATION_SCAN_CHARS = 4096
+_kb_semantic_cache = deque(maxlen=KB_SEMANTIC_CACHE_SIZE)  # (kb_id, ttl bucket, embedding, raw results)
+_kb_semantic_lock = threading.Lock()
+
+
+if orjson is not None:
+    def _dumps(obj, default=None) -> bytes:
+        return orjson.dumps(obj, default=default)
+    _loads = orjson.loads
+else:
+    def _dumps(obj, default=None) -> bytes:
+        return json.dumps(obj, default=default).encode("utf-8")
+    _loads = json.loads
+
+
+_JSON_SPAN_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def _widest_json_span(text: str) -> Optional[str]:
+    match = _JSON_SPAN_RE.search(text)
+    return match.group(0) if match else None
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy src to dst without moving bytes through userspace when possible
+    
+    Tries a hardlink first (same filesystem), then copy_file_range (lets
+    the kernel reflink/splice), and finally shutil.copy2.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    
+    shutil.copy2(src, dst)
+
+
+@lru_cache(maxsize=None)
+def _bedrock_agent_client(region: str):
+    """One bedrock-agent-runtime client per region (boto3 clients are thread-safe)"""
+    return boto3.client("bedrock-agent-runtime", region_name=region, config=_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def _embedding_client(region: str):
+    return boto3.client("bedrock-runtime", region_name=region, config=_CLIENT_CONFIG)
+
+
+def _semantic_cache_enabled() -> bool:
+    return np is not None and os.environ.get("KB_SEMANTIC_CACHE") == "1"
+
+
+def _embed_query(region: str, query: str):
+    """Unit-length Titan embedding for a query"""
+    response = _embedding_client(region).invoke_model(
+        modelId=KB_EMBED_MODEL_ID,
+        body=json.dumps({"inputText": query}),
+        accept="application/json",
+        contentType="application/json"
+    )
+    vector = np.asarray(json.loads(response["body"].read())["embedding"], dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def _semantic_lookup(kb_id: str, ttl_bucket: int, embedding) -> Optional[bytes]:
+    with _kb_semantic_lock:
+        for cached_kb_id, cached_bucket, cached_embedding, raw in _kb_semantic_cache:
+            if (cached_kb_id == kb_id and cached_bucket == ttl_bucket
+                    and float(np.dot(embedding, cached_embedding)) > KB_SEMANTIC_THRESHOLD):
+                return raw
+    return None
+
+
+def _semantic_store(kb_id: str, ttl_bucket: int, embedding, raw: bytes) -> None:
+    with _kb_semantic_lock:
+        _kb_semantic_cache.append((kb_id, ttl_bucket, embedding, raw))
+
+
+def _ttl_bucket() -> int:
+    """Changes every KB_CACHE_TTL_SECONDS; entries keyed on an older value are never hit"""
+    return int(time.time() // KB_CACHE_TTL_SECONDS)
+
+
+class _NoResults(Exception):
+    """Raised by _retrieve_raw for an empty result set, which lru_cache then doesn't keep"""
+
+
+class _NormalizedQuery(str):
+    """
+    Cache key of a KB query: the lowercased, whitespace-collapsed text
+    
+    Hashes and compares as that normalized str, while .text keeps the
+    caller's wording, which is what the KB is actually searched with.
+    """
+    
+    def __new__(cls, text: str) -> "_NormalizedQuery":
+        key = super().__new__(cls, _WHITESPACE_RE.sub(' ', text.strip().lower()))
+        key.text = text
+        return key
+
+
+@lru_cache(maxsize=256)
+def _retrieve_raw(kb_id: str, region: str, query_norm: _NormalizedQuery, ttl_bucket: int) -> bytes:
+    """
+    Retrieve KB results as encoded JSON (exact-match tier)
+    
+    The body only runs on an exact-match miss; it then consults the semantic
+    tier (when enabled) before calling bedrock-agent-runtime. Both are given
+    the original query text (query_norm.text); the normalized form only keys
+    the cache. ttl_bucket (see _ttl_bucket) expires entries.
+    
+    Raises:
+        _NoResults: nothing matched - not cached, the KB may gain entries
+    """
+    query = query_norm.text
+    embedding = _embed_query(region, query) if _semantic_cache_enabled() else None
+    if embedding is not None:
+        cached = _semantic_lookup(kb_id, ttl_bucket, embedding)
+        if cached is not None:
+            logger.info("[KB-TOOL] ♻️  Semantic cache hit")
+            return cached
+    
+    response = _bedrock_agent_client(region).retrieve(
+        knowledgeBaseId=kb_id,
+        retrievalQuery={'text': query},
+        retrievalConfiguration={
+            'vectorSearchConfiguration': {
+                'numberOfResults': 5
+            }
+        }
+    )
+    results = response.get('retrievalResults', [])
+    if not results:
+        raise _NoResults()
+    raw = _dumps(results, default=str)
+    if embedding is not None:
+        _semantic_store(kb_id, ttl_bucket, embedding, raw)
+    return raw
+
+
+def _retrieve_cached(kb_id: str, region: str, query: str) -> List[Dict]:
+    """Retrieve KB results through the query cache (KB_CACHE_DISABLE=1 bypasses it)"""
+    query_norm = _NormalizedQuery(query)
+    retrieve = _retrieve_raw.__wrapped__ if os.environ.get("KB_CACHE_DISABLE") == "1" else _retrieve_raw
+    try:
+        return _loads(retrieve(kb_id, region, query_norm, _ttl_bucket()))
+    except _NoResults:
+        return []
+
+
+# Large payloads go to S3; results keep a short str preview plus a "<field>_ref" URI
+STASH_THRESHOLD_BYTES = 4096
+STASH_PREVIEW_CHARS = 200
+STASH_BUCKET = os.environ.get("STASH_BUCKET", "presales-rfp-outputs")
+STASHED_URIS_MAX = 1024
+_stashed_uris = OrderedDict()  # recently uploaded blobs (LRU, bounded)
+_stashed_lock = threading.Lock()
+
+
+def _stash_large(s3_client, obj, bucket: str, user: str) -> Optional[str]:
+    """
+    Upload obj to S3 when its JSON encoding is large
+    
+    Blobs are content-addressed ({user}/cache/{sha256}.json), so a payload
+    uploaded recently by this process is not uploaded again.
+    
+    Returns:
+        S3 URI of the blob, or None if obj is small or the upload failed
+        (callers then keep their inline/truncated value)
+    """
+    body = _dumps(obj, default=str)
+    if len(body) <= STASH_THRESHOLD_BYTES:
+        return None
+    
+    key = f"{user}/cache/{hashlib.sha256(body).hexdigest()}.json"
+    s3_uri = f"s3://{bucket}/{key}"
+    with _stashed_lock:
+        if s3_uri in _stashed_uris:
+            _stashed_uris.move_to_end(s3_uri)
+            return s3_uri
+    
+    try:
+        s3_client.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/json")
+    except Exception as e:
+        logger.warning("[S3] ⚠️  Stash failed, keeping payload inline: %s", e)
+        return None
+    
+    with _stashed_lock:
+        _stashed_uris[s3_uri] = None
+        if len(_stashed_uris) > STASHED_URIS_MAX:
+            _stashed_uris.popitem(last=False)
+    return s3_uri
+
+
+def deref(s3_uri: str, s3_client=None):
+    """Load a payload stashed by _stash_large from its S3 URI"""
+    bucket, _, key = s3_uri[len("s3://"):].partition("/")
+    s3_client = s3_client or boto3.client("s3", config=_CLIENT_CONFIG)
+    return _loads(s3_client.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+
+_MCP_START_LOCK = threading.Lock()
+_MCP_CLIENTS: Dict[Tuple[str, ...], MCPClient] = {}
+
+
+def _shared_mcp_client(args: List[str]) -> MCPClient:
+    """
+    Process-wide MCPClient for a uvx server command
+    
+    Every AWSArchitectureAgent reuses the same client, so the uvx server is
+    spawned at most once per process instead of once per agent/request.
+    """
+    key = tuple(args)
+    with _MCP_START_LOCK:
+        client = _MCP_CLIENTS.get(key)
+        if client is None:
+            client = MCPClient(
+                lambda: stdio_client(
+                    StdioServerParameters(command="uvx", args=list(key))
+                )
+            )
+            _MCP_CLIENTS[key] = client
+        return client
+
+
+def _ensure_started(client: MCPClient) -> None:
+    """Start the MCP client's uvx server on first use (no-op if already running)"""
+    with _MCP_START_LOCK:
+        if not client._is_session_active():
+            logger.info("[MCP] 🚀 Starting MCP server on first use...")
+            client.start()
+            atexit.register(client.stop, None, None, None)
+
+
+def _load_tool_schemas(client: MCPClient, cmd_args: List[str], cache_ttl_seconds: int = 3600) -> List[MCPTool]:
+    """
+    Get MCP tool schemas, from the on-disk cache for this server command when fresh
+    
+    Only a cache miss starts the server to call list_tools.
+    
+    Args:
+        client: MCP client for the server
+        cmd_args: Server command + args, hashed into the cache key
+        cache_ttl_seconds: Max age of a cached tool list
+    
+    Returns:
+        MCP tool schemas
+    """
+    if os.environ.get("MCP_TOOL_CACHE_DISABLE") == "1":
+        _ensure_started(client)
+        return [t.mcp_tool for t in client.list_tools_sync()]
+    
+    key = hashlib.sha256(json.dumps(cmd_args).encode("utf-8")).hexdigest()
+    cache_file = MCP_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < cache_ttl_seconds:
+            return [MCPTool.model_validate(schema) for schema in json.loads(cache_file.read_text())]
+    except (OSError, ValueError):
+        pass  # Missing, stale or corrupt cache - re-query the server
+    
+    _ensure_started(client)
+    schemas = [t.mcp_tool for t in client.list_tools_sync()]
+    try:
+        MCP_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps([schema.model_dump(mode="json") for schema in schemas]))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("[AGENT] ⚠️  Could not cache MCP tools: %s", e)
+    return schemas
+
+
+class LazyMCPTool(MCPAgentTool):
+    """
+    MCP tool that plans from a cached schema and only launches its uvx
+    server (stdio handshake) the first time the agent actually calls it
+    """
+    
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        await asyncio.to_thread(_ensure_started, self.mcp_client)
+        async for event in super().stream(tool_use, invocation_state, **kwargs):
+            yield event
+
+
+ARCH_MODEL_ID = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
+# Opt-in: Bedrock prompt caching of the tools + system prompt prefix
+USE_PROMPT_CACHE = os.getenv("ARCH_PROMPT_CACHE", "").lower() in ("1", "true", "yes")
+
+_SYSTEM_PROMPT = """You are an expert AWS Solutions Architect specializing in reference architecture selection and design.
+
+**Your Tools:**
+
+1. **search_knowledge_base_diagrams(query)** - Search company's approved architectures
+   - Returns: Previously approved architecture diagrams with image URIs
+   - IMPORTANT: KB may be EMPTY initially - only populated after SOW approval
+   - If empty, this is NORMAL - proceed with MCP tools
+
+2. **MCP Server Tools** - AWS Reference Architectures
+   - get_diagram_examples - View example diagrams that are similar to user prompt and use them as reference template
+   - generate_diagram - Create architecture diagrams from reference aws architectural diagram template
+   - AWS service documentation tools
+
+**Workflow:**
+
+Step 1: From the requirements, identify:
+1. **Application Type Keywords:**
+   - "chatbot" → search for: "chatbot architecture", "conversational AI"
+   - "e-commerce" → search for: "online store", "shopping cart"
+
+2. **Technical Capabilities:**
+   - Authentication → Include "Cognito" in search
+   - Real-time updates → Include "WebSocket", "EventBridge"
+   - File storage → Include "S3"
+   - Database → Include "DynamoDB", "RDS"
+   - AI/ML → Include "Bedrock", "SageMaker"
+   - API → Include "API Gateway", "AppSync"
+
+3. **Scale Requirements:**
+   - "10,000 users" → "scalable", "auto-scaling"
+   - "high availability" → "multi-AZ", "fault-tolerant"
+   - "global" → "CloudFront", "multi-region"
+
+STEP 2: SEARCH FOR REFERENCE ARCHITECTURES
+- Call search_knowledge_base_diagrams(requirements)
+- Call get_diagram_examples also for reference patterns
+
+STEP 3: SELECT BEST TEMPLATE
+- Score available templates (0-10) for similarity
+- Explain which AWS reference pattern matches best
+
+STEP 4: GENERATE CUSTOM ARCHITECTURE WITH DIAGRAM
+- Use generate_diagram to create visual diagram from technical requirements and reference architecture diagram base template(base template isn't always image)
+- IMPORTANT: Diagrams are saved in a "diagrams" subdirectory of the user's workspace by default
+- Create detailed architecture specification as JSON
+- Include BOTH diagram s3 file paths in response:
+  * custom diagram path (newly generated)
+  * reference diagram path (template used)
+- MANDATORY: Note the file path where diagram is generated and store it in diagram_path in JSON(mandatory)
+
+Return analysis as JSON:
+{
+    "search_results": {
+        "kb_diagrams": [...],
+        "reference_patterns": [...]
+    },
+    "selected_template": {
+        "source": "...",
+        "title": "...",
+        "reasoning": "...",
+        "reference_path": "path/to/reference/diagram_title.png"
+    },
+    "custom_architecture": {
+        "name": "...",
+        "aws_services": [...],
+        "architecture": {...},
+        "diagram_path": ""path/to/generated/diagram.png" //mandatory and critical
+    }
+}
+"""
+
+# Everything that doesn't vary per run; requirements are appended after it
+_PROMPT_PREFIX = """Generate AWS reference architecture for the requirements below.
+
+Workflow:
+1. Search KB for approved architectures (may be empty - that's OK)
+2. Search AWS Reference Architectures via MCP
+3. Compare available diagrams, select BEST template with respect to technical requirements
+4. Generate custom architecture based on selected template using the aws-diagram tool that combines:
+   - Best practices from the reference architecture
+   - Specific requirements from the user
+   - Proper AWS service configurations
+
+CRITICAL:- Diagrams are saved in a "diagrams" subdirectory of the user's workspace by default note its file path in your response.
+
+Provide complete analysis in JSON format including all diagram paths.
+
+Requirements:"""
+
+
 class AWSArchitectureAgent:
     """
     AWS Architecture Generation Agent with Diagram Storage
@@ -29,63 +492,80 @@ class AWSArchitectureAgent:
     - Saves diagrams locally and to S3
     """
     
+    # Streams diagram uploads; multipart (parallel parts) kicks in above 8 MB
+    _transfer_config = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True
+    )
+    
+    # Process-wide instances keyed on (kb_id, region, model_id)
+    _INSTANCES: Dict[Tuple, "AWSArchitectureAgent"] = {}
+    _INSTANCES_LOCK = threading.Lock()
+    
+    @classmethod
+    def get_or_create(cls, region: str = "us-east-1", kb_id: Optional[str] = None) -> "AWSArchitectureAgent":
+        """
+        Return the cached agent for this configuration, building it on first use
+        
+        Reusing the instance keeps clients, the model and the collected tools
+        warm across tool invocations. Runs don't share conversation state:
+        each builds its own strands Agent (see _run).
+        """
+        key = (kb_id, region, ARCH_MODEL_ID)
+        instance = cls._INSTANCES.get(key)
+        if instance is None:
+            with cls._INSTANCES_LOCK:
+                instance = cls._INSTANCES.get(key)
+                if instance is None:
+                    instance = cls(region=region, kb_id=kb_id)
+                    cls._INSTANCES[key] = instance
+        return instance
+    
     def __init__(self, region: str = "us-east-1", kb_id: Optional[str] = None):
         self.region = region
         self.kb_id = os.environ.get('KB_ID')
-        self.s3 = boto3.client("s3", region_name=region)
-        self.bedrock = boto3.client("bedrock-runtime", region_name=region)
+        self.s3 = boto3.client("s3", region_name=region, config=_CLIENT_CONFIG)
+        self.bedrock = boto3.client("bedrock-runtime", region_name=region, config=_CLIENT_CONFIG)
         
         # Create local diagram directory
         self.local_diagram_dir = Path("./generated_diagrams")
         self.local_diagram_dir.mkdir(exist_ok=True)
-        print(f"[INFO] Local diagram directory: {self.local_diagram_dir.absolute()}")
+        logger.info("Local diagram directory: %s", self.local_diagram_dir.absolute())
         
-        # Initialize MCP Clients - will be started in context manager
-        import shutil
+        # MCP Clients - shared by every agent in the process, servers start
+        # lazily on first tool call and stay up until interpreter exit
         use_uvx = shutil.which("uvx") is not None
         
         if use_uvx:
-            print("[INFO] Setting up MCP clients...")
+            logger.info("Setting up MCP clients...")
             
             # Standard docs client (no extra dependencies needed)
-            self.aws_docs_client = MCPClient(
-                lambda: stdio_client(
-                    StdioServerParameters(
-                        command="uvx", 
-                        args=["awslabs.aws-documentation-mcp-server@latest"]
-                    )
-                )
-            )
+            self.aws_docs_client = _shared_mcp_client(AWS_DOCS_MCP_ARGS)
             
             # Diagram client with dependency
-            self.aws_diag_client = MCPClient(
-                lambda: stdio_client(
-                    StdioServerParameters(
-                        command="uvx",
-                        args=[
-                            "--with", "jschema-to-python",
-                            "--with", "diagrams",
-                            "--with", "graphviz",  
-                            "awslabs.aws-diagram-mcp-server@latest"
-                        ]
-                    )
-                )
-            )
-            print("[INFO] MCP clients configured (first run may be slow, then cached)")
+            self.aws_diag_client = _shared_mcp_client(AWS_DIAGRAM_MCP_ARGS)
+            logger.info("MCP clients configured (first run may be slow, then cached)")
         else:
-            print("[WARN] uvx not found. MCP tools will be disabled.")
-            print("[WARN] Install uv with: curl -LsSf https://astral.sh/uv/install.sh | sh")
+            logger.warning("uvx not found. MCP tools will be disabled.")
+            logger.warning("Install uv with: curl -LsSf https://astral.sh/uv/install.sh | sh")
             self.aws_docs_client = None
             self.aws_diag_client = None
         
         # Bedrock Model
         self.bedrock_model = BedrockModel(
-            model_id="us.anthropic.claude-3-5-sonnet-20241022-v2:0",
+            model_id=ARCH_MODEL_ID,
             region_name=region,
             temperature=0.4,
+            **({"cache_prompt": "default"} if USE_PROMPT_CACHE else {}),
         )
         
         self.agent = None
+        # Tool list is built once and shared; each run gets its own strands
+        # Agent (not thread-safe) on top of it, so concurrent runs don't block
+        self.tools = None
+        self._tools_lock = threading.Lock()
     
     # ============================================
     # Knowledge Base Tool (Handles Empty KB)
@@ -97,25 +577,16 @@ class AWSArchitectureAgent:
         region = self.region
         s3_client = self.s3
         
-        # Helper functions (outside the tool)
+        # Helper functions (outside the tool) - annotation fields sit near the top
         def extract_image_uri(content: str) -> Optional[str]:
             """Extract image S3 URI from annotation content"""
-            import re
-            match = re.search(r'IMAGE_URI:\s*(s3://[^\s\n]+)', content)
-            if match:
-                return match.group(1)
-            match = re.search(r'REFERENCE_IMAGE:\s*(s3://[^\s\n]+)', content)
-            if match:
-                return match.group(1)
-            return None
+            match = _IMG_URI_RE.search(content, 0, ANNOTATION_SCAN_CHARS)
+            return match.group(1) if match else None
         
         def extract_title(content: str) -> Optional[str]:
             """Extract title from annotation"""
-            import re
-            match = re.search(r'Title:\s*([^\n]+)', content)
-            if match:
-                return match.group(1).strip()
-            return None
+            match = _TITLE_RE.search(content, 0, ANNOTATION_SCAN_CHARS)
+            return match.group(1).strip() if match else None
         
         # Now create the actual tool
         @tool
@@ -141,22 +612,11 @@ class AWSArchitectureAgent:
                 })
             
             try:
-                bedrock_agent = boto3.client("bedrock-agent-runtime", region_name=region)
-                
-                print(f"[KB-TOOL] 🔍 Searching Knowledge Base...")
-                
-                response = bedrock_agent.retrieve(
-                    knowledgeBaseId=kb_id,
-                    retrievalQuery={'text': query},
-                    retrievalConfiguration={
-                        'vectorSearchConfiguration': {
-                            'numberOfResults': 5
-                        }
-                    }
-                )
+                logger.info("[KB-TOOL] 🔍 Searching Knowledge Base...")
                 
                 results = []
-                for item in response.get('retrievalResults', []):
+                contents = []  # full annotation text of each result
+                for item in _retrieve_cached(kb_id, region, query):
                     content = item.get('content', {}).get('text', '')
                     score = item.get('score', 0)
                     
@@ -176,22 +636,31 @@ class AWSArchitectureAgent:
                             'has_diagram': True,
                             'type': 'approved_architecture'
                         })
+                        contents.append(content)
+                
+                # Only the returned hits are stashed; the full annotation
+                # stays in S3, the prompt gets the 300-char description
+                for result, content in zip(results[:3], contents):
+                    if len(content) > STASH_THRESHOLD_BYTES:
+                        ref = _stash_large(s3_client, content, STASH_BUCKET, "knowledge_base")
+                        if ref:
+                            result['description_ref'] = ref
                 
                 if results:
-                    print(f"[KB-TOOL] ✅ Found {len(results)} approved diagrams")
+                    logger.info("[KB-TOOL] ✅ Found %s approved diagrams", len(results))
                 else:
-                    print(f"[KB-TOOL] ℹ️  No diagrams in KB yet (empty or no matches)")
+                    logger.info("[KB-TOOL] ℹ️  No diagrams in KB yet (empty or no matches)")
                 
-                return json.dumps({
+                return _dumps({
                     "status": "success",
                     "source": "knowledge_base",
                     "results_count": len(results),
                     "results": results[:3],
                     "note": "KB may be empty - populated after SOW approval"
-                }, indent=2)
+                }).decode("utf-8")
                 
             except Exception as e:
-                print(f"[KB-TOOL] ⚠️  KB search failed: {e}")
+                logger.warning("[KB-TOOL] ⚠️  KB search failed: %s", e)
                 return json.dumps({
                     "status": "error",
                     "source": "knowledge_base",
@@ -206,7 +675,8 @@ class AWSArchitectureAgent:
     # Diagram Storage Methods
     # ============================================
     
-    def _save_diagram_locally(self, diagram_path: str, user: str, file_name: str, diagram_type: str = "custom") -> Optional[str]:
+    def _save_diagram_locally(self, diagram_path: str, user: str, file_name: str, run_ts: str,
+                              diagram_type: str = "custom") -> Optional[str]:
         """
         Save diagram to local directory with standard naming
         
@@ -214,33 +684,36 @@ class AWSArchitectureAgent:
             diagram_path: Path to the generated diagram
             user: User identifier
             file_name: Base file name
+            run_ts: Run timestamp shared by every artifact of the run
             diagram_type: Type of diagram (custom/reference)
         
         Returns:
             Local path to saved diagram
         """
+        # The path comes from the model's JSON and may be any type
+        if not isinstance(diagram_path, str) or not diagram_path:
+            logger.warning("[LOCAL] ⚠️  Invalid diagram path: %r", diagram_path)
+            return None
+        
         try:
-            if not os.path.exists(diagram_path):
-                print(f"[LOCAL] ⚠️  Diagram not found at {diagram_path}")
-                return None
-            
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            local_filename = f"{file_name}_{timestamp}_{diagram_type}_diagram.png"
+            local_filename = f"{file_name}_{run_ts}_{diagram_type}_diagram.png"
             local_path = self.local_diagram_dir / local_filename
             
-            # Copy diagram to local directory
-            import shutil
-            shutil.copy2(diagram_path, local_path)
+            # Link (or kernel-side copy) diagram into local directory
+            _fast_copy(diagram_path, local_path)
             
-            print(f"[LOCAL] 💾 Saved locally: {local_path}")
+            logger.info("[LOCAL] 💾 Saved locally: %s", local_path)
             return str(local_path)
             
-        except Exception as e:
-            print(f"[LOCAL] ❌ Failed to save locally: {e}")
+        except FileNotFoundError:
+            logger.warning("[LOCAL] ⚠️  Diagram not found at %s", diagram_path)
+            return None
+        except (OSError, ValueError) as e:  # ValueError: e.g. NUL byte in the path
+            logger.error("[LOCAL] ❌ Failed to save locally: %s", e)
             return None
     
     def _upload_diagram_to_s3(self, local_path: str, user: str, file_name: str, 
-                             bucket: str, diagram_type: str = "custom") -> Optional[str]:
+                             bucket: str, run_ts: str, diagram_type: str = "custom") -> Optional[str]:
         """
         Upload diagram to S3 with standard naming convention
         
@@ -249,37 +722,55 @@ class AWSArchitectureAgent:
             user: User identifier
             file_name: Base file name
             bucket: S3 bucket name
+            run_ts: Run timestamp shared by every artifact of the run
             diagram_type: Type of diagram (custom/reference)
         
         Returns:
             S3 URI of uploaded diagram
         """
         try:
-            if not os.path.exists(local_path):
-                print(f"[S3] ⚠️  Local file not found: {local_path}")
-                return None
-            
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            s3_key = f"{user}/diagrams/{file_name}_{timestamp}_{diagram_type}_diagram.png"
-            
-            with open(local_path, 'rb') as f:
-                self.s3.put_object(
-                    Bucket=bucket,
-                    Key=s3_key,
-                    Body=f.read(),
-                    ContentType='image/png'
-                )
+            s3_key = f"{user}/diagrams/{file_name}_{run_ts}_{diagram_type}_diagram.png"
+            
+            self.s3.upload_file(
+                Filename=local_path,
+                Bucket=bucket,
+                Key=s3_key,
+                ExtraArgs={'ContentType': 'image/png'},
+                Config=self._transfer_config
+            )
             
             s3_uri = f"s3://{bucket}/{s3_key}"
-            print(f"[S3] ☁️  Uploaded to: {s3_uri}")
+            logger.info("[S3] ☁️  Uploaded to: %s", s3_uri)
             return s3_uri
             
-        except Exception as e:
-            print(f"[S3] ❌ Failed to upload to S3: {e}")
+        except FileNotFoundError:
+            logger.warning("[S3] ⚠️  Local file not found: %s", local_path)
+            return None
+        except (OSError, ClientError, BotoCoreError, S3UploadFailedError) as e:
+            logger.error("[S3] ❌ Failed to upload to S3: %s", e)
             return None
     
+    def _store_one(self, kind: str, path: str, user: str, base_file_name: str,
+                   output_bucket: str, run_ts: str) -> Tuple[str, Dict]:
+        """
+        Save one diagram locally and upload it to S3
+        
+        Returns:
+            (kind, {'original_path', 'local_path', 's3_uri'}) - empty dict if the local save failed
+        """
+        local_path = self._save_diagram_locally(path, user, base_file_name, run_ts, kind)
+        if not local_path:
+            return kind, {}
+        
+        s3_uri = self._upload_diagram_to_s3(path, user, base_file_name, output_bucket, run_ts, kind)
+        return kind, {
+            'original_path': path,
+            'local_path': local_path,
+            's3_uri': s3_uri
+        }
+    
     def _process_generated_diagrams(self, architecture_response: Dict, user: str, 
-                                   base_file_name: str, output_bucket: str) -> Dict:
+                                   base_file_name: str, output_bucket: str, run_ts: str) -> Dict:
         """
         Process all diagrams from architecture generation
         
@@ -288,6 +779,7 @@ class AWSArchitectureAgent:
             user: User identifier
             base_file_name: Base name for files
             output_bucket: S3 bucket for uploads
+            run_ts: Run timestamp shared by every artifact of the run
         
         Returns:
             Dict with local and S3 paths for all diagrams
@@ -301,134 +793,50 @@ class AWSArchitectureAgent:
             # Extract diagram paths from response
             arch_data = architecture_response.get('architecture', {})
             
-            # Process custom diagram
+            # Collect diagrams to store (custom + reference)
+            tasks = {}
             custom_path = architecture_response.get('custom_architecture', {}).get('diagram_path')
-            if custom_path and os.path.exists(custom_path):
-                print(f"[DIAGRAM] 🎨 Processing custom diagram: {custom_path}")
-                
-                local_path = self._save_diagram_locally(
-                    custom_path, user, base_file_name, "custom"
-                )
-                
-                if local_path:
-                    print("custom IMG found")
-                    s3_uri = self._upload_diagram_to_s3(
-                        custom_path, user, base_file_name, output_bucket, "custom"
-                    )
-                    
-                    diagram_paths['custom_diagram'] = {
-                        'original_path': custom_path,
-                        'local_path': local_path,
-                        's3_uri': s3_uri
-                    }
-                
-            # Process reference diagram
+            if custom_path:
+                logger.info("[DIAGRAM] 🎨 Processing custom diagram: %s", custom_path)
+                tasks['custom'] = custom_path
             
             ref_path = architecture_response.get('selected_template', {}).get('reference_path')
-            if ref_path and os.path.exists(ref_path):
-                print(f"[DIAGRAM] 📋 Processing reference diagram: {ref_path}")
-                print("reference IMG found")
-                
-                local_path = self._save_diagram_locally(
-                    ref_path, user, base_file_name, "reference"
-                )
-                
-                if local_path:
-                    s3_uri = self._upload_diagram_to_s3(
-                        ref_path, user, base_file_name, output_bucket, "reference"
-                    )
-                    
-                    diagram_paths['reference_diagram'] = {
-                        'original_path': ref_path,
-                        'local_path': local_path,
-                        's3_uri': s3_uri
-                    }
+            if ref_path:
+                logger.info("[DIAGRAM] 📋 Processing reference diagram: %s", ref_path)
+                tasks['reference'] = ref_path
             
+            # Uploads are network-bound, so store diagrams concurrently
+            if tasks:
+                with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+                    futures = [
+                        pool.submit(self._store_one, kind, path, user, base_file_name, output_bucket, run_ts)
+                        for kind, path in tasks.items()
+                    ]
+                    for future in as_completed(futures):
+                        kind, paths = future.result()
+                        if paths:
+                            diagram_paths[f'{kind}_diagram'] = paths
             
         except Exception as e:
-            print(f"[DIAGRAM] ❌ Error processing diagrams: {e}")
-        print("!Diagram path!")
-        print(json.dumps(diagram_paths))
+            logger.error("[DIAGRAM] ❌ Error processing diagrams: %s", e)
+        logger.debug("[DIAGRAM] Diagram paths: %s", diagram_paths)
         return diagram_paths
     
     # ============================================
     # Create Agent with All Tools
     # ============================================
     
-    def create_agent(self):
-        """Create agent with KB + MCP tools"""
-        
-        system_prompt = """You are an expert AWS Solutions Architect specializing in reference architecture selection and design.
-
-**Your Tools:**
-
-1. **search_knowledge_base_diagrams(query)** - Search company's approved architectures
-   - Returns: Previously approved architecture diagrams with image URIs
-   - IMPORTANT: KB may be EMPTY initially - only populated after SOW approval
-   - If empty, this is NORMAL - proceed with MCP tools
-
-2. **MCP Server Tools** - AWS Reference Architectures
-   - get_diagram_examples - View example diagrams that are similar to user prompt and use them as reference template
-   - generate_diagram - Create architecture diagrams from reference aws architectural diagram template
-   - AWS service documentation tools
-
-**Workflow:**
-
-Step 1: From the requirements, identify:
-1. **Application Type Keywords:**
-   - "chatbot" → search for: "chatbot architecture", "conversational AI"
-   - "e-commerce" → search for: "online store", "shopping cart"
-
-2. **Technical Capabilities:**
-   - Authentication → Include "Cognito" in search
-   - Real-time updates → Include "WebSocket", "EventBridge"
-   - File storage → Include "S3"
-   - Database → Include "DynamoDB", "RDS"
-   - AI/ML → Include "Bedrock", "SageMaker"
-   - API → Include "API Gateway", "AppSync"
-
-3. **Scale Requirements:**
-   - "10,000 users" → "scalable", "auto-scaling"
-   - "high availability" → "multi-AZ", "fault-tolerant"
-   - "global" → "CloudFront", "multi-region"
-
-STEP 2: SEARCH FOR REFERENCE ARCHITECTURES
-- Call search_knowledge_base_diagrams(requirements)
-- Call get_diagram_examples also for reference patterns
-
-STEP 3: SELECT BEST TEMPLATE
-- Score available templates (0-10) for similarity
-- Explain which AWS reference pattern matches best
-
-STEP 4: GENERATE CUSTOM ARCHITECTURE WITH DIAGRAM
-- Use generate_diagram to create visual diagram from technical requirements and reference architecture diagram base template(base template isn't always image)
-- IMPORTANT: Diagrams are saved in a "diagrams" subdirectory of the user's workspace by default
-- Create detailed architecture specification as JSON
-- Include BOTH diagram s3 file paths in response:
-  * custom diagram path (newly generated)
-  * reference diagram path (template used)
-- MANDATORY: Note the file path where diagram is generated and store it in diagram_path in JSON(mandatory)
-
-Return analysis as JSON:
-{
-    "search_results": {
-        "kb_diagrams": [...],
-        "reference_patterns": [...]
-    },
-    "selected_template": {
-        "source": "...",
-        "title": "...",
-        "reasoning": "...",
-        "reference_path": "path/to/reference/diagram_title.png"
-    },
-    "custom_architecture": {
-        "name": "...",
-        "aws_services": [...],
-        "architecture": {...},
-        "diagram_path": ""path/to/generated/diagram.png" //mandatory and critical
-    }
-}
-"""
+    def _collect_tools(self) -> List:
+        """Build the KB + MCP tool list once per instance (shared by every run)"""
+        if self.tools is not None:
+            return self.tools
+        with self._tools_lock:
+            if self.tools is None:
+                self.tools = self._build_tools()
+        return self.tools
+    
+    def _build_tools(self) -> List:
+        """Collect KB tool + MCP tools"""
         
         # Collect KB tool
         kb_tool = self._create_kb_tool()
@@ -436,34 +844,45 @@ Return analysis as JSON:
         # Get MCP tools using list_tools_sync()
         try:
             if self.aws_docs_client and self.aws_diag_client:
-                print(f"[AGENT] 🔧 Collecting MCP tools...")
-                mcp_tools = (
-                    list(self.aws_diag_client.list_tools_sync()) +
-                    list(self.aws_docs_client.list_tools_sync())
-                )
+                logger.info("[AGENT] 🔧 Collecting MCP tools...")
+                mcp_tools = [
+                    LazyMCPTool(schema, client)
+                    for client, args in (
+                        (self.aws_diag_client, AWS_DIAGRAM_MCP_ARGS),
+                        (self.aws_docs_client, AWS_DOCS_MCP_ARGS),
+                    )
+                    for schema in _load_tool_schemas(client, ["uvx"] + args)
+                ]
                 all_tools = [kb_tool] + mcp_tools
 
-                print("all tools list")
-                for i in all_tools:
-                    print(i)
-                print(f"[AGENT] ✅ Initialized with {len(all_tools)} tools")
-                print(f"[AGENT]   - KB Tool: 1")
-                print(f"[AGENT]   - MCP Tools: {len(mcp_tools)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for t in all_tools:
+                        logger.debug("[AGENT] tool: %s", t)
+                logger.info("[AGENT] ✅ Initialized with %s tools", len(all_tools))
+                logger.info("[AGENT]   - KB Tool: 1")
+                logger.info("[AGENT]   - MCP Tools: %s", len(mcp_tools))
             else:
-                print(f"[AGENT] ⚠️  MCP clients not available (uvx not installed)")
-                print(f"[AGENT] ℹ️  Using KB tool only")
+                logger.warning("[AGENT] ⚠️  MCP clients not available (uvx not installed)")
+                logger.info("[AGENT] ℹ️  Using KB tool only")
                 all_tools = [kb_tool]
         except Exception as e:
-            print(f"[AGENT] ⚠️  MCP tools unavailable: {e}")
-            print(f"[AGENT] ℹ️  Using KB tool only")
+            logger.warning("[AGENT] ⚠️  MCP tools unavailable: %s", e)
+            logger.info("[AGENT] ℹ️  Using KB tool only")
             all_tools = [kb_tool]
         
-        self.agent = Agent(
+        return all_tools
+    
+    def _new_agent(self) -> Agent:
+        """Fresh strands Agent (empty history) on the shared model and tools"""
+        return Agent(
             model=self.bedrock_model,
-            system_prompt=system_prompt,
-            tools=all_tools
+            system_prompt=_SYSTEM_PROMPT,
+            tools=self._collect_tools()
         )
-        
+    
+    def create_agent(self):
+        """Create agent with KB + MCP tools"""
+        self.agent = self._new_agent()
         return self.agent
     
     # ============================================
@@ -487,103 +906,110 @@ Return analysis as JSON:
         Returns:
             Architecture with selected template and generation details
         """
-        print(f"\n{'='*70}")
-        print(f"🏗️ AWS ARCHITECTURE GENERATION")
-        print(f"{'='*70}")
-        print(f"📋 Requirements: {technical_requirements[:100]}...")
-        print(f"🗄️  KB ID: {self.kb_id or 'Not configured (will use MCP only)'}")
+        result, _ = self._run(technical_requirements, parsed_key, output_bucket)
+        return result
+    
+    def _run(
+        self,
+        technical_requirements: str,
+        parsed_key: str,
+        output_bucket: Optional[str] = None
+    ) -> Tuple[Dict, Optional[bytes]]:
+        """Same as run, but also returns the JSON body saved to S3 (None if not saved)"""
+        # One clock read per run so local files, S3 keys and the result JSON correlate
+        run_at = datetime.now(timezone.utc)
+        run_ts = run_at.strftime("%Y%m%d_%H%M%S")
+        logger.info("🏗️ AWS ARCHITECTURE GENERATION")
+        logger.info("📋 Requirements: %s...", technical_requirements[:100])
+        logger.info("🗄️  KB ID: %s", self.kb_id or 'Not configured (will use MCP only)')
         # Create folder (and parent directories if needed)
         os.makedirs("generated_diagram", exist_ok=True)
         
         try:
-            # Ensure agent is created
-            if not self.agent:
-                print(f"[AGENT] ⚠️  Agent not created yet, creating now...")
-                self.create_agent()
-            
             # Extract user from parsed_key
             user = parsed_key.split("/")[0]
             base_file_name = os.path.basename(parsed_key).replace('.json', '')
             
             # Build prompt
-            prompt = f"""Generate AWS reference architecture for these requirements:
-
-{technical_requirements}
+            # Constant prefix first, variable requirements last (cacheable prefix)
+            prompt = _PROMPT_PREFIX + "\n\n" + technical_requirements
 
-Workflow:
-1. Search KB for approved architectures (may be empty - that's OK)
-2. Search AWS Reference Architectures via MCP
-3. Compare available diagrams, select BEST template with respect to technical requirements
-4. Generate custom architecture based on selected template using the aws-diagram tool that combines:
-   - Best practices from the reference architecture
-   - Specific requirements from the user
-   - Proper AWS service configurations
-
-CRITICAL:- Diagrams are saved in a "diagrams" subdirectory of the user's workspace by default note its file path in your response.
-
-Provide complete analysis in JSON format including all diagram paths."""
-
-            print(f"\n[AGENT] 🚀 Generating architecture...")
+            # Own agent per run: get_or_create shares this instance, and the
+            # model, tools and clients are reused, not the conversation
+            agent = self._new_agent()
+            
+            logger.info("[AGENT] 🚀 Generating architecture...")
             
-            # Run agent (agent must be created inside MCP context)
-            response = self.agent(prompt)
+            # Run agent (MCP servers start on first tool call)
+            response = agent(prompt)
             
             # Parse response
             result = self._parse_response(response)
             
             # Process and store diagrams
             if output_bucket:
-                print(f"\n[DIAGRAM] 📦 Processing diagrams for storage...")
+                logger.info("[DIAGRAM] 📦 Processing diagrams for storage...")
                 diagram_paths = self._process_generated_diagrams(
-                    result, user, base_file_name, output_bucket
+                    result, user, base_file_name, output_bucket, run_ts
                 )
                 result['diagram_storage'] = diagram_paths
+                
+                # Unparsed responses carry the full text - keep it out of the result
+                architecture = result.get('architecture')
+                if isinstance(architecture, dict) and 'raw_response' in architecture:
+                    raw_response = architecture['raw_response']
+                    ref = _stash_large(self.s3, raw_response, output_bucket, user)
+                    if ref:
+                        architecture['raw_response'] = raw_response[:STASH_PREVIEW_CHARS]
+                        architecture['raw_response_ref'] = ref
             
             # Add metadata
             result['metadata'] = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': run_at.replace(tzinfo=None).isoformat(),  # naive UTC, as before
                 'kb_configured': bool(self.kb_id),
                 'user': user,
                 'requirements': technical_requirements[:500] + "...",
                 'status': 'success'
             }
             
-            # Save JSON result to S3
+            # Save JSON result to S3 - serialized once, body reused by the tool
+            body = None
             if output_bucket:
-                s3_path = self._save_to_s3(result, parsed_key, output_bucket)
-                result['s3_path'] = s3_path
+                out_key = self._result_key(parsed_key, run_ts)
+                result['s3_path'] = f"s3://{output_bucket}/{out_key}"
+                body = _dumps(result, default=str)
+                if not self._save_to_s3(body, out_key, output_bucket):
+                    result['s3_path'] = None
+                    body = None
             
-            print(f"\n[AGENT] ✅ Architecture generated!")
-            print(f"{'='*70}\n")
+            logger.info("[AGENT] ✅ Architecture generated!")
             
-            return result
+            return result, body
             
         except Exception as e:
-            print(f"[AGENT] ❌ Error: {e}")
+            logger.exception("[AGENT] ❌ Error: %s", e)
             import traceback
-            traceback.print_exc()
             
             return {
                 'status': 'error',
                 'error': str(e),
                 'traceback': traceback.format_exc()
-            }
+            }, None
     
     def _parse_response(self, response) -> Dict:
         """Parse agent response"""
         response_text = str(response)
         
-        import re
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        
-        if json_match:
+        # First balanced object, then the widest {...} span as a fallback
+        candidates = (find_json_object(response_text), _widest_json_span(response_text))
+        for candidate in dict.fromkeys(c for c in candidates if c):
             try:
                 return {
                     'status': 'success',
-                    'architecture': json.loads(json_match.group(0)),
+                    'architecture': _loads(candidate),
                     'raw_response': response_text[:500]
                 }
-            except:
+            except ValueError:
                 pass
         
         return {
@@ -592,27 +1018,29 @@ Provide complete analysis in JSON format including all diagram paths."""
             'note': 'Could not parse JSON'
         }
     
-    def _save_to_s3(self, result: Dict, parsed_key: str, bucket: str) -> str:
-        """Save JSON result to S3"""
+    @staticmethod
+    def _result_key(parsed_key: str, run_ts: str) -> str:
+        """S3 key for the architecture JSON derived from parsed_key"""
+        # Extract user prefix from parsed_key
+        user_prefix = parsed_key.split("/")[0]
+        out_folder = f"{user_prefix}/aws_architectures/"
+        return f"{out_folder}{os.path.basename(parsed_key).replace('.json','')}_architecture_{run_ts}.json"
+    
+    def _save_to_s3(self, body: bytes, out_key: str, bucket: str) -> Optional[str]:
+        """Save pre-serialized JSON result to S3"""
         try:
-            # Extract user prefix from parsed_key
-            user_prefix = parsed_key.split("/")[0]
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            out_folder = f"{user_prefix}/aws_architectures/"
-            out_key = f"{out_folder}{os.path.basename(parsed_key).replace('.json','')}_architecture_{timestamp}.json"
-
             self.s3.put_object(
                 Bucket=bucket,
                 Key=out_key,
-                Body=json.dumps(result, indent=2).encode("utf-8"),
+                Body=body,
                 ContentType="application/json"
             )
             
             s3_path = f"s3://{bucket}/{out_key}"
-            print(f"[S3] 💾 Saved JSON: {s3_path}")
+            logger.info("[S3] 💾 Saved JSON: %s", s3_path)
             return s3_path
         except Exception as e:
-            print(f"[S3] ⚠️  Save failed: {e}")
+            logger.warning("[S3] ⚠️  Save failed: %s", e)
             return None
 
 
@@ -645,20 +1073,21 @@ def create_aws_architecture_tool(kb_id: Optional[str] = None, region: str = "us-
             JSON with selected template and generated architecture
         """
         try:
-            print(f"[AWS-ARCH-TOOL] 🏗️ Starting architecture generation...")
+            logger.info("[AWS-ARCH-TOOL] 🏗️ Starting architecture generation...")
             
-            agent = AWSArchitectureAgent(region=region, kb_id=kb_id)
+            agent = AWSArchitectureAgent.get_or_create(region=region, kb_id=kb_id)
             
-            result = agent.run(
+            result, body = agent._run(
                 technical_requirements=technical_requirements,
                 parsed_key="auto_generated",
                 output_bucket="presales-rfp-outputs"
             )
             
-            return json.dumps(result, indent=2)
+            # Reuse the bytes already written to S3 instead of re-encoding
+            return body.decode("utf-8") if body else json.dumps(result)
             
         except Exception as e:
-            print(f"[AWS-ARCH-TOOL] ❌ Error: {e}")
+            logger.error("[AWS-ARCH-TOOL] ❌ Error: %s", e)
             return json.dumps({
                 'status': 'error',
                 'error': str(e)
@@ -674,6 +1103,8 @@ def create_aws_architecture_tool(kb_id: Optional[str] = None, region: str = "us-
 if __name__ == "__main__":
     import sys
     
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    
     # Configuration
     KB_ID = os.environ.get('KB_ID')
     REGION = "us-east-1"
@@ -682,53 +1113,44 @@ if __name__ == "__main__":
     clarification_key = "ravi/clarifications/RFP_5_20251017_030359_parsed_clarifications_20251017_030413.json"
     bucket_name = "presales-rfp-outputs"
     
-    s3 = boto3.client("s3", region_name=REGION)
+    s3 = boto3.client("s3", region_name=REGION, config=_CLIENT_CONFIG)
 
+    # The stored JSON goes into the prompt as-is (no parse/re-dump round-trip);
+    # both bodies are streamed straight into one buffer, so only a single
+    # copy of the combined bytes exists before the final decode.
+    buf = bytearray()
+    
     # --- STEP 1: Load parsed requirements ---
-    print(f"[INFO] Loading parsed requirements from s3://{bucket_name}/{parsed_key}")
-    parsed_obj = s3.get_object(Bucket=bucket_name, Key=parsed_key)
-    parsed_data = json.loads(parsed_obj["Body"].read().decode("utf-8"))
+    logger.info("Loading parsed requirements from s3://%s/%s", bucket_name, parsed_key)
+    buf += b"### RFP Requirements:\n"
+    for chunk in s3.get_object(Bucket=bucket_name, Key=parsed_key)["Body"].iter_chunks():
+        buf += chunk
     
     # --- STEP 2: Load clarifications ---
-    print(f"[INFO] Loading clarifications from s3://{bucket_name}/{clarification_key}")
-    clar_obj = s3.get_object(Bucket=bucket_name, Key=clarification_key)
-    clar_data = json.loads(clar_obj["Body"].read().decode("utf-8"))
+    logger.info("Loading clarifications from s3://%s/%s", bucket_name, clarification_key)
+    buf += b"\n\n### Clarifications:\n"
+    for chunk in s3.get_object(Bucket=bucket_name, Key=clarification_key)["Body"].iter_chunks():
+        buf += chunk
     
     # --- STEP 3: Combine both into a single requirement prompt ---
-    combined_requirements = "### RFP Requirements:\n"
-    combined_requirements += json.dumps(parsed_data, indent=2)
-    combined_requirements += "\n\n### Clarifications:\n"
-    combined_requirements += json.dumps(clar_data, indent=2)
+    combined_requirements = buf.decode("utf-8")
+    del buf
     
-    print(f"[INFO] Combined RFP and Clarifications loaded successfully.")
-    print(f"Testing with KB ID: {KB_ID or 'None (MCP only)'}")
+    logger.info("Combined RFP and Clarifications loaded successfully.")
+    logger.info("Testing with KB ID: %s", KB_ID or 'None (MCP only)')
     
-    # Create and run agent - MCP clients must be used in context
+    # Create and run agent - MCP servers start lazily on first tool use
     agent = AWSArchitectureAgent()
+    if not (agent.aws_docs_client and agent.aws_diag_client):
+        logger.info("MCP not available, using KB tool only...")
+    agent.create_agent()
     
-    # CRITICAL: Everything must happen INSIDE the MCP context
-    if agent.aws_docs_client and agent.aws_diag_client:
-        print("[INFO] Starting MCP client sessions...")
-        with agent.aws_docs_client, agent.aws_diag_client:
-            print("[INFO] MCP clients started, creating agent...")
-            agent.create_agent()  # Create agent INSIDE context - this calls list_tools_sync()
-            
-            print("[INFO] Running architecture generation...")
-            result = agent.run(
-                technical_requirements=combined_requirements,
-                parsed_key=parsed_key,
-                output_bucket="presales-rfp-outputs"
-            )
-        print("[INFO] MCP client sessions closed")
-    else:
-        # Run without MCP context (KB tool only)
-        print("[INFO] MCP not available, using KB tool only...")
-        agent.create_agent()
-        result = agent.run(
-            technical_requirements=combined_requirements,
-            parsed_key=parsed_key,
-            output_bucket="presales-rfp-outputs"
-        )
+    logger.info("Running architecture generation...")
+    result = agent.run(
+        technical_requirements=combined_requirements,
+        parsed_key=parsed_key,
+        output_bucket="presales-rfp-outputs"
+    )
     
     # Print result
     print("\n" + "="*70)
@@ -1,71 +1,422 @@
 # clarification_agent_claude.py
 # Updated Clarification Agent using Claude 3.5 Sonnet (with automatic inference profile lookup)
 
-import boto3, json, re, uuid, os
-from datetime import datetime
+import asyncio, boto3, gzip, hashlib, json, logging, re, threading, uuid, os
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from strands import Agent
 
+try:
+    from Agents.json_scan import BraceTracker, find_json_object
+except ImportError:  # run as a script from Agents/
+    from json_scan import BraceTracker, find_json_object
+
+logger = logging.getLogger(__name__)
+
+# Optional: exact token budgeting when tiktoken is installed.
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 ALLOWED_CATEGORIES = [
     "Scope", "Timeline", "Budget", "Technical", "Compliance",
     "Integration", "Deliverables", "Assumptions", "Other"
 ]
 
+DOMAIN_CONTEXT = {
+    "health": "Healthcare domain — focus on interoperability (HL7/FHIR), HIPAA compliance, and clinical analytics.",
+    "finance": "Finance domain — emphasize PCI-DSS, risk/fraud prevention, and regulatory compliance.",
+    "retail": "Retail domain — emphasize scalability, omnichannel experiences, and inventory integrations.",
+    "manufacturing": "Manufacturing domain — focus on predictive maintenance, IoT data, and automation reliability.",
+}
+DEFAULT_DOMAIN_HINT = "Domain unclear — focus on scope, integration gaps, and deliverables."
+_DOMAIN_RE = re.compile("|".join(f"(?P<{k}>{re.escape(k)})" for k in DOMAIN_CONTEXT))
+
+# Per-field token budgets for the RFP extracts fed into the prompt.
+PROMPT_TOKEN_BUDGET = {"background": 300, "technical_asks": 200, "functional_asks": 200}
+CHARS_PER_TOKEN = 3.5
+
+# Used when no model produces usable clarifications.
+_FALLBACK_TEMPLATE = [
+    {
+        "category": "Timeline",
+        "question_fmt": "Can you confirm if the stated project timeline ({timelines}) includes testing and support phases?",
+        "required": True,
+        "priority": 1,
+    },
+    {
+        "category": "Budget",
+        "question_fmt": "Does the provided budget ({budget}) include licenses and cloud costs?",
+        "required": True,
+        "priority": 1,
+    },
+    {
+        "category": "Technical",
+        "question_fmt": "Do you have preferred cloud or technology stack (e.g., AWS, Azure)?",
+        "required": True,
+        "priority": 1,
+    },
+]
+
+CLAUDE_MODEL_ID = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+TITAN_MODEL_ID = "amazon.titan-text-express-v1"
+
+_FENCE_RE = re.compile(r"```(?:json)?")
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Model responses are cached in the output bucket, keyed by prompt + model.
+CACHE_PREFIX = "_cache/clarifications"
+CACHE_TTL_SECONDS = int(os.getenv("CLARIFICATION_CACHE_TTL", "86400"))
+
+# auto: Claude hedged with Titan; claude_only: no Titan; fallback_only: no model calls.
+CLARIFICATION_MODES = ("auto", "claude_only", "fallback_only")
+JSON_REPAIR_NUDGE = "Return JSON only, no prose, beginning with {."
+
+# Seconds to wait for Claude's first streamed token before racing the Titan fallback against it.
+HEDGE_DELAY_SECONDS = float(os.getenv("CLARIFICATION_HEDGE_DELAY", "0.8"))
+
+# Shared across agent instances so connections and credentials are reused.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+# Adaptive mode rate-limits client-side and honours server retry-after hints;
+# a tight attempt cap keeps throttled calls from stalling for ~20 s.
+_BEDROCK_CONFIG = _CLIENT_CONFIG.merge(Config(
+    retries={"max_attempts": 2, "mode": "adaptive"},
+    connect_timeout=3,
+    read_timeout=60,
+))
+# Claude is hedged with Titan, so botocore retries would only delay the race.
+_HEDGED_CONFIG = _BEDROCK_CONFIG.merge(Config(retries={"max_attempts": 1, "mode": "adaptive"}))
+# Opt-in: only valid for buckets with Transfer Acceleration enabled.
+USE_S3_ACCEL = os.getenv("USE_S3_ACCEL", "").lower() in ("1", "true", "yes")
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedRFP:
+    """The parsed-RFP fields the clarification prompt uses, with defaults applied once."""
+    domain: str = "General"
+    background: str = ""
+    technical_asks: str = ""
+    functional_asks: str = ""
+    timelines: str = "not specified"
+    estimated_budget: str = "not specified"
+
+    @classmethod
+    def from_dict(cls, parsed):
+        values = {}
+        for name in cls.__dataclass_fields__:
+            value = parsed.get(name)
+            if value is not None:
+                values[name] = value if isinstance(value, str) else str(value)
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Load the tiktoken encoding on first use (it may download the BPE file)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")  # close-enough proxy for Claude
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable, budgeting by characters: %s", e)
+        return None
+
+
+def _clip(text, max_tokens):
+    """Trim text to about max_tokens, cutting on a token (or word) boundary."""
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+
+@lru_cache(maxsize=4)
+def _session(region):
+    return boto3.session.Session(region_name=region)
+
+
+# Session.client() is not thread-safe and lru_cache does not serialize a first
+# miss, so concurrent runs (run_many, the prewarm thread) create clients under this.
+_CLIENT_LOCK = threading.Lock()
+
+
+def _client(region, service, config):
+    with _CLIENT_LOCK:
+        return _session(region).client(service, config=config)
+
+
+@lru_cache(maxsize=4)
+def _s3(region, accelerate=False):
+    config = _CLIENT_CONFIG
+    if accelerate:
+        config = config.merge(Config(s3={"use_accelerate_endpoint": True}))
+    return _client(region, "s3", config)
+
+
+@lru_cache(maxsize=4)
+def _bedrock_runtime(region):
+    return _client(region, "bedrock-runtime", _BEDROCK_CONFIG)
+
+
+@lru_cache(maxsize=4)
+def _bedrock_runtime_hedged(region):
+    return _client(region, "bedrock-runtime", _HEDGED_CONFIG)
+
+
+@lru_cache(maxsize=8)
+def _resolve_profile(region, model_id):
+    """Locate (once per region/model) an inference profile ARN for Claude.
+
+    Set INFERENCE_PROFILE_ARN to skip the ListInferenceProfiles call entirely.
+    """
+    override = os.getenv("INFERENCE_PROFILE_ARN")
+    if override:
+        return override
+    bedrock_mgmt = _client(region, "bedrock", None)
+    try:
+        profiles = bedrock_mgmt.list_inference_profiles()["inferenceProfileSummaries"]
+        for p in profiles:
+            if model_id in p.get("modelArn", "") or model_id in p.get("inferenceProfileArn", ""):
+                return p["inferenceProfileArn"]
+    except Exception as e:
+        logger.warning("Could not list inference profiles: %s", e)
+    raise Exception(f"No inference profile found for {model_id}")
+
 
 class ClarificationAgent(Agent):
-    def __init__(self, name="clarification-agent-claude", region="us-east-1"):
+    def __init__(self, name="clarification-agent-claude", region="us-east-1", s3_region=None, mode=None):
         super().__init__(name=name)
         self.region = region
-        self.s3 = boto3.client("s3", region_name=region)
-        self.bedrock = boto3.client("bedrock-runtime", region_name=region)
-        self.profile_arn = self._find_inference_profile("anthropic.claude-3-5-sonnet-20241022-v2:0")
-        print(f"[INFO] ✅ Using Claude 3.5 Sonnet profile: {self.profile_arn}")
-
-    def _find_inference_profile(self, model_id):
-        """Automatically locate an inference profile ARN for Claude."""
-        bedrock_mgmt = boto3.client("bedrock", region_name=self.region)
-        try:
-            profiles = bedrock_mgmt.list_inference_profiles()["inferenceProfileSummaries"]
-            for p in profiles:
-                if model_id in p.get("modelArn", "") or model_id in p.get("inferenceProfileArn", ""):
-                    return p["inferenceProfileArn"]
-        except Exception as e:
-            print(f"[WARN] Could not list inference profiles: {e}")
-        raise Exception(f"No inference profile found for {model_id}")
+        # S3 can live in the bucket's home region independently of Bedrock.
+        self.s3_region = s3_region or region
+        self.mode = mode or os.getenv("CLARIFICATION_MODE", "auto")
+        if self.mode not in CLARIFICATION_MODES:
+            raise ValueError(f"mode must be one of {CLARIFICATION_MODES}, got {self.mode!r}")
+        self.profile_arn = None
+        if self.mode != "fallback_only":
+            self.profile_arn = _resolve_profile(region, CLAUDE_MODEL_ID)
+            logger.info("✅ Using Claude 3.5 Sonnet profile: %s", self.profile_arn)
+
+    @property
+    def s3(self):
+        return _s3(self.s3_region, USE_S3_ACCEL)
+
+    @property
+    def bedrock(self):
+        return _bedrock_runtime(self.region)
+
+    @property
+    def bedrock_hedged(self):
+        return _bedrock_runtime_hedged(self.region)
 
     # ---------- S3 Utilities ----------
     def read_json_from_s3(self, bucket, key):
         obj = self.s3.get_object(Bucket=bucket, Key=key)
-        return json.loads(obj["Body"].read().decode("utf-8"))
+        body = obj["Body"]
+        if obj.get("ContentEncoding") == "gzip":
+            body = gzip.GzipFile(fileobj=body)
+        # json.load decodes the UTF-8 bytes itself; no intermediate str copy.
+        return json.load(body)
 
-    def write_json_to_s3(self, bucket, key, data):
-        self.s3.put_object(
-            Bucket=bucket, Key=key, Body=json.dumps(data, indent=2).encode("utf-8")
-        )
+    def write_json_to_s3(self, bucket, key, data, indent=None, compress=False):
+        """Write JSON to S3. Only compress objects this agent reads back itself;
+        downstream agents and the frontend expect plain JSON bodies."""
+        separators = None if indent else (",", ":")
+        body = json.dumps(data, indent=indent, separators=separators).encode("utf-8")
+        extra = {"ContentType": "application/json"}
+        if compress:
+            body = gzip.compress(body, compresslevel=3)
+            extra["ContentEncoding"] = "gzip"
+        self.s3.put_object(Bucket=bucket, Key=key, Body=body, **extra)
         return f"s3://{bucket}/{key}"
 
+    # ---------- Response Cache ----------
+    def _cache_key(self, prompt):
+        payload = json.dumps({"prompt": prompt, "model": self.profile_arn}, sort_keys=True)
+        return f"{CACHE_PREFIX}/{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.json"
+
+    def read_cached_clarifications(self, bucket, cache_key):
+        """Return cached clarifications for this prompt, or None on miss/expiry."""
+        try:
+            head = self.s3.head_object(Bucket=bucket, Key=cache_key)
+        except ClientError:
+            return None
+        age = (datetime.now(timezone.utc) - head["LastModified"]).total_seconds()
+        if age > CACHE_TTL_SECONDS:
+            return None
+        return self.read_json_from_s3(bucket, cache_key).get("clarifications")
+
+    def write_cached_clarifications(self, bucket, cache_key, clarifications):
+        try:
+            self.write_json_to_s3(bucket, cache_key, {"clarifications": clarifications}, compress=True)
+        except ClientError as e:
+            logger.warning("Could not write clarification cache: %s", e)
+
+    # ---------- Bedrock Invocation ----------
+    def _prewarm_bedrock(self):
+        """Open the Claude client's TLS connection ahead of the first real call.
+
+        Best effort: runs in the background and nothing waits for it.
+        """
+        try:
+            self.bedrock_hedged.list_async_invokes(maxResults=1)
+        except (ClientError, BotoCoreError) as e:
+            # Even a denied call leaves a warm pooled connection behind.
+            logger.debug("Bedrock prewarm call failed: %s", e)
+
+    def _invoke_claude(self, prompt, previous=None, started=None):
+        """Stream Claude via Converse and stop reading once the JSON object closes.
+
+        Passing the previous (non-JSON) reply asks Claude to repair it as JSON.
+        `started` (a threading.Event) is set on the first streamed text.
+        """
+        messages = [{"role": "user", "content": [{"text": prompt}]}]
+        if previous is not None:
+            if previous.strip():
+                messages.append({"role": "assistant", "content": [{"text": previous}]})
+                messages.append({"role": "user", "content": [{"text": JSON_REPAIR_NUDGE}]})
+            else:
+                messages[0]["content"][0]["text"] = f"{prompt}\n\n{JSON_REPAIR_NUDGE}"
+        resp = self.bedrock_hedged.converse_stream(
+            modelId=self.profile_arn,
+            messages=messages,
+            inferenceConfig={"temperature": 0.4, "maxTokens": 2000},
+        )
+        stream = resp["stream"]
+        tracker = BraceTracker()
+        chunks = []
+        try:
+            for event in stream:
+                text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+                if not text:
+                    continue
+                if started is not None:
+                    started.set()
+                    started = None
+                end = tracker.feed(text)
+                if end >= 0:
+                    chunks.append(text[:end])
+                    break
+                chunks.append(text)
+        finally:
+            stream.close()
+        return "".join(chunks)
+
+    def _invoke_titan(self, prompt):
+        payload = {
+            "inputText": prompt,
+            "textGenerationConfig": {"temperature": 0.4, "maxTokenCount": 2000},
+        }
+        resp = self.bedrock.invoke_model(
+            modelId=TITAN_MODEL_ID,
+            body=json.dumps(payload),
+            accept="application/json",
+            contentType="application/json",
+        )
+        raw = resp["body"].read().decode("utf-8")
+        out = json.loads(raw)
+        return out["results"][0]["outputText"]
+
+    def _invoke_hedged(self, prompt):
+        """Invoke Claude, racing Titan against it if Claude is slow to start, fails, or returns no JSON.
+
+        Titan is started when Claude has streamed no text after HEDGE_DELAY_SECONDS,
+        or when Claude fails. A Claude reply without JSON gets one repair turn
+        before Titan is tried. Once Claude is streaming its answer is preferred:
+        a Titan reply is only used if Claude produces no JSON.
+        In claude_only mode Titan is never used.
+        Returns (text, model name): the first response containing JSON, else any
+        text received.
+        """
+        claude, repair = "Claude 3.5 Sonnet", "Claude 3.5 Sonnet (JSON repair)"
+        pool = ThreadPoolExecutor(max_workers=2)
+        logger.info("🚀 Invoking Claude 3.5 Sonnet...")
+        started = threading.Event()  # Claude's first token, or Claude finished
+        claude_future = pool.submit(self._invoke_claude, prompt, None, started)
+        claude_future.add_done_callback(lambda _: started.set())
+        futures = {claude_future: claude}
+        hedged = self.mode == "claude_only"
+        titan_text = None
+        fallback = None  # (text, model name) of the first reply without JSON
+        last_error = None
+        try:
+            if not hedged and not started.wait(HEDGE_DELAY_SECONDS):
+                hedged = True
+                logger.info("🔁 Claude has not started streaming; hedging with Titan Text Express...")
+                futures[pool.submit(self._invoke_titan, prompt)] = "Titan"
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = futures.pop(fut)
+                    try:
+                        text = fut.result()
+                    except Exception as e:
+                        logger.warning("%s failed: %s", name, e)
+                        last_error = e
+                        continue
+                    if self.extract_json(text):
+                        if name == "Titan" and futures and started.is_set():
+                            # Claude is answering; keep Titan's reply in reserve.
+                            titan_text = text
+                            continue
+                        logger.info("✅ %s succeeded.", name)
+                        return text, name
+                    logger.warning("%s returned no JSON.", name)
+                    fallback = fallback or (text, name)
+                    if name == claude:
+                        logger.info("🔧 Asking Claude to return JSON only...")
+                        futures[pool.submit(self._invoke_claude, prompt, text)] = repair
+                if not hedged and not futures:
+                    hedged = True
+                    logger.info("🔁 Hedging with Titan Text Express...")
+                    futures[pool.submit(self._invoke_titan, prompt)] = "Titan"
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if titan_text is not None:
+            logger.info("✅ Titan succeeded.")
+            return titan_text, "Titan"
+        if fallback is None and last_error is not None:
+            logger.error("Claude and Titan both failed: %s", last_error)
+            raise last_error
+        return fallback or (None, None)
+
     # ---------- JSON Extraction ----------
     def extract_json(self, text):
-        text = re.sub(r"```json|```", "", text).strip()
-        m = re.search(r"\{[\s\S]*\}", text)
+        text = _FENCE_RE.sub("", text).strip()
+        obj = find_json_object(text)
+        if obj is not None:
+            return obj
+        m = _JSON_RE.search(text)
         return m.group(0) if m else None
 
     # ---------- Prompt Builder ----------
-    def build_prompt(self, parsed):
-        domain = parsed.get("domain", "General").lower()
-        background = parsed.get("background", "")[:800]
-        technical = parsed.get("technical_asks", "")[:600]
-        functional = parsed.get("functional_asks", "")[:600]
-        timelines = parsed.get("timelines", "not specified")
-        budget = parsed.get("estimated_budget", "not specified")
-
-        domain_context = {
-            "health": "Healthcare domain — focus on interoperability (HL7/FHIR), HIPAA compliance, and clinical analytics.",
-            "finance": "Finance domain — emphasize PCI-DSS, risk/fraud prevention, and regulatory compliance.",
-            "retail": "Retail domain — emphasize scalability, omnichannel experiences, and inventory integrations.",
-            "manufacturing": "Manufacturing domain — focus on predictive maintenance, IoT data, and automation reliability.",
-        }
-        domain_hint = next((v for k, v in domain_context.items() if k in domain), 
-                           "Domain unclear — focus on scope, integration gaps, and deliverables.")
+    def build_prompt(self, rfp):
+        if isinstance(rfp, dict):
+            rfp = ParsedRFP.from_dict(rfp)
+        domain = rfp.domain.lower()
+        background = _clip(rfp.background, PROMPT_TOKEN_BUDGET["background"])
+        technical = _clip(rfp.technical_asks, PROMPT_TOKEN_BUDGET["technical_asks"])
+        functional = _clip(rfp.functional_asks, PROMPT_TOKEN_BUDGET["functional_asks"])
+        timelines = rfp.timelines
+        budget = rfp.estimated_budget
+
+        m = _DOMAIN_RE.search(domain)
+        domain_hint = DOMAIN_CONTEXT[m.lastgroup] if m else DEFAULT_DOMAIN_HINT
 
         return f"""
 You are an experienced **Presales Solution Architect** preparing for a client clarification round.
@@ -102,118 +453,110 @@ Task:
 }}
 """
 
-    # ---------- Main Execution ----------
-    def run(self, bucket_in, parsed_key, bucket_out):
-        print(f"[INFO] Running ClarificationAgent (Claude 3.5) for: {parsed_key}")
+    # ---------- Model Generation ----------
+    def _generate_clarifications(self, prompt, bucket_out):
+        """Return model clarifications for the prompt, served from the response cache when fresh."""
+        cache_key = self._cache_key(prompt)
+        clarifications = self.read_cached_clarifications(bucket_out, cache_key)
+        if clarifications:
+            logger.info("♻️ Using %d cached clarifications.", len(clarifications))
+            return clarifications
 
-        parsed = self.read_json_from_s3(bucket_in, parsed_key)
-        prompt = self.build_prompt(parsed)
-
-        model_output = None
-
-        # ---------- Try Claude 3.5 Sonnet ----------
-        try:
-            print("[INFO] 🚀 Invoking Claude 3.5 Sonnet...")
-            payload = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2000,
-                "temperature": 0.4,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-
-            resp = self.bedrock.invoke_model(
-                modelId=self.profile_arn,
-                body=json.dumps(payload),
-                accept="application/json",
-                contentType="application/json",
-            )
-            out = json.loads(resp["body"].read().decode("utf-8"))
-            model_output = out["content"][0]["text"]
-            print("[INFO] ✅ Claude 3.5 Sonnet succeeded.")
-        except Exception as e:
-            print(f"[WARN] Claude failed: {e}")
-            model_output = None
-
-        # ---------- Titan fallback ----------
-        if not model_output:
-            try:
-                print("[INFO] 🔁 Falling back to Titan Text Express...")
-                payload = {
-                    "inputText": prompt,
-                    "textGenerationConfig": {"temperature": 0.4, "maxTokenCount": 2000},
-                }
-                resp = self.bedrock.invoke_model(
-                    modelId="amazon.titan-text-express-v1",
-                    body=json.dumps(payload),
-                    accept="application/json",
-                    contentType="application/json",
-                )
-                raw = resp["body"].read().decode("utf-8")
-                out = json.loads(raw)
-                model_output = out["results"][0]["outputText"]
-                print("[INFO] ✅ Titan succeeded as fallback.")
-            except Exception as e:
-                print(f"[ERROR] Titan fallback also failed: {e}")
-                raise
+        # ---------- Claude 3.5 Sonnet, hedged with Titan ----------
+        model_output, model_name = self._invoke_hedged(prompt)
 
         # ---------- Parse Clarifications ----------
         clarifications = []
-        extracted = self.extract_json(model_output)
+        extracted = self.extract_json(model_output) if model_output else None
         if extracted:
             try:
                 data = json.loads(extracted)
                 clarifications = data.get("clarifications", [])
-                print(f"[INFO] Extracted {len(clarifications)} clarifications.")
+                logger.info("Extracted %d clarifications.", len(clarifications))
             except Exception as e:
-                print(f"[WARN] JSON parse failed: {e}")
+                logger.warning("JSON parse failed: %s", e)
+        # The cache is keyed on Claude's profile: never store a Titan answer under it.
+        if clarifications and model_name != "Titan":
+            self.write_cached_clarifications(bucket_out, cache_key, clarifications)
+        elif clarifications:
+            logger.info("Not caching clarifications from %s.", model_name)
+        return clarifications
+
+    # ---------- Main Execution ----------
+    def run(self, bucket_in, parsed_key, bucket_out):
+        logger.info("Running ClarificationAgent (Claude 3.5) for: %s", parsed_key)
+
+        if self.mode == "fallback_only":
+            rfp = ParsedRFP.from_dict(self.read_json_from_s3(bucket_in, parsed_key))
+            clarifications = []
+        else:
+            # Overlap the S3 read with the Bedrock TLS handshake; only the
+            # read is waited for, the prewarm finishes in the background.
+            pool = ThreadPoolExecutor(max_workers=2)
+            pool.submit(self._prewarm_bedrock)
+            parsed_future = pool.submit(self.read_json_from_s3, bucket_in, parsed_key)
+            pool.shutdown(wait=False)
+            rfp = ParsedRFP.from_dict(parsed_future.result())
+            clarifications = self._generate_clarifications(self.build_prompt(rfp), bucket_out)
 
         # ---------- Fallback Generator ----------
         if not clarifications:
-            print("[WARN] Using fallback clarification generator.")
+            logger.warning("Using fallback clarification generator.")
             clarifications = [
                 {
                     "question_id": str(uuid.uuid4()),
-                    "category": "Timeline",
-                    "question": f"Can you confirm if the stated project timeline ({parsed.get('timelines','N/A')}) includes testing and support phases?",
-                    "required": True,
-                    "priority": 1,
-                },
-                {
-                    "question_id": str(uuid.uuid4()),
-                    "category": "Budget",
-                    "question": f"Does the provided budget ({parsed.get('estimated_budget','N/A')}) include licenses and cloud costs?",
-                    "required": True,
-                    "priority": 1,
-                },
-                {
-                    "question_id": str(uuid.uuid4()),
-                    "category": "Technical",
-                    "question": "Do you have preferred cloud or technology stack (e.g., AWS, Azure)?",
-                    "required": True,
-                    "priority": 1,
-                },
+                    "category": t["category"],
+                    "question": t["question_fmt"].format(
+                        timelines=rfp.timelines,
+                        budget=rfp.estimated_budget,
+                    ),
+                    "required": t["required"],
+                    "priority": t["priority"],
+                }
+                for t in _FALLBACK_TEMPLATE
             ]
 
+        now = datetime.now(timezone.utc)
         clarifications_obj = {
             "clarifications": clarifications[:5],
             "status": "pending",
             "source_file": parsed_key,
-            "generated_at": datetime.utcnow().isoformat(),
+            # Same format as before: naive UTC ISO 8601 with microseconds.
+            "generated_at": now.replace(tzinfo=None).isoformat(),
         }
 
-        ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        ts = now.strftime("%Y%m%d_%H%M%S")
         user_prefix = parsed_key.split("/")[0]
         out_folder = f"{user_prefix}/clarifications/"
         out_key = f"{out_folder}{os.path.basename(parsed_key).replace('.json','')}_clarifications_{ts}.json"
 
-        self.s3.put_object(Bucket=bucket_out, Key=out_folder)
         s3uri = self.write_json_to_s3(bucket_out, out_key, clarifications_obj)
-        print(f"[INFO] Clarifications saved to {s3uri}")
+        logger.info("Clarifications saved to %s", s3uri)
         return out_key
 
+    async def run_many(self, bucket_in, keys, bucket_out, concurrency=8, on_error="continue"):
+        """Run the agent over several parsed keys concurrently.
+
+        Returns results aligned with keys. With on_error="continue" a failed key
+        yields its exception instead of failing the batch; "raise" propagates it.
+        """
+        if on_error not in ("continue", "raise"):
+            raise ValueError(f"on_error must be 'continue' or 'raise', got {on_error!r}")
+        loop = asyncio.get_running_loop()
+        # The pool size caps in-flight Bedrock calls.
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            return await asyncio.gather(
+                *(loop.run_in_executor(pool, self.run, bucket_in, key, bucket_out) for key in keys),
+                return_exceptions=(on_error == "continue"),
+            )
+        finally:
+            pool.shutdown(wait=False)
+
 
 # --- Local test example ---
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
     agent = ClarificationAgent(region="us-east-1")
     key = "ravi/parsed_outputs/RFP_1_20251013_045445_parsed.json"
     output = agent.run("presales-rfp-outputs", key, "presales-rfp-outputs")
@@ -0,0 +1,49 @@
+"""
+String-aware JSON object scanning shared by the agents
+
+Model replies wrap their JSON in prose or code fences; these helpers find
+the first complete top-level {...} object, ignoring braces inside JSON
+strings (including escaped quotes).
+"""
+
+from typing import Optional
+
+
+class BraceTracker:
+    """Incrementally track JSON brace depth, ignoring braces inside strings."""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text):
+        """Consume text; return the offset just past the closing top-level brace, or -1."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.started:
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+def find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, or None."""
+    start = text.find("{")
+    if start < 0:
+        return None
+    end = BraceTracker().feed(text[start:])
+    return text[start:start + end] if end >= 0 else None
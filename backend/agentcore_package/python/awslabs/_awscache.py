@@ -0,0 +1,124 @@
+import functools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Tuple
+
+TTL_SECONDS = 5
+
+# small enough for every ec2 describe_* (route tables and NACLs cap at 100)
+PAGE_SIZE = 100
+
+# operations whose filter parameter isn't called `Filters`
+_FILTER_PARAM = {'describe_nat_gateways': 'Filter'}
+
+_pool = ThreadPoolExecutor(max_workers=4)
+
+
+@functools.lru_cache(maxsize=None)
+def _session():
+    """
+    returns the session and client config shared by every client. boto3 is
+    imported here, on first use, so starting or listing challenges doesn't
+    pay for loading botocore
+    """
+    import boto3
+    from botocore.config import Config
+
+    # validators fan out several calls per service; keep their connections
+    # open and let botocore back off adaptively when throttled
+    config = Config(
+        max_pool_connections=50,
+        retries={'max_attempts': 5, 'mode': 'adaptive'},
+        tcp_keepalive=True,
+    )
+    # one session for every client, so credentials, the loader cache and the
+    # endpoint resolver are set up once
+    return boto3.session.Session(), config
+
+
+@functools.lru_cache(maxsize=None)
+def client(service: str):
+    """
+    returns a process-wide boto3 client for `service`, created on first use
+    """
+    session, config = _session()
+    return session.client(service, config=config)
+
+
+def ttl_hash(seconds: int = TTL_SECONDS) -> int:
+    """
+    returns a value that changes every `seconds`; pass it as the `ttl`
+    argument so cached describe results expire
+    """
+    return int(time.time() / seconds)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_describe_stack(name: str, ttl: int) -> dict:
+    """ cloudformation describe_stacks for a single stack """
+    return client('cloudformation').describe_stacks(StackName=name)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_describe_stack_resources(name: str, logical_id: str, ttl: int) -> dict:
+    """ cloudformation describe_stack_resources for one logical resource """
+    return client('cloudformation').describe_stack_resources(
+        StackName=name,
+        LogicalResourceId=logical_id
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def cached_describe_instance(instance_id: str, ttl: int) -> dict:
+    """ ec2 describe_instances for a single instance """
+    return client('ec2').describe_instances(InstanceIds=[instance_id])
+
+
+@functools.lru_cache(maxsize=16)
+def cached_describe_service(cluster: str, service: str, ttl: int) -> dict:
+    """ ecs describe_services for a single service """
+    return client('ecs').describe_services(cluster=cluster, services=[service])
+
+
+def filters(by_name: Dict[str, Iterable[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    turns {'vpc-id': [vpc_id], ...} into the hashable `filter_by` argument
+    of cached_describe_all
+    """
+    return tuple((name, tuple(values)) for name, values in by_name.items())
+
+
+@functools.lru_cache(maxsize=32)
+def cached_describe_all(service: str, operation: str, ttl: int, filter_by: tuple = ()) -> dict:
+    """
+    full result of a paginated describe_* call, so validators and their
+    helpers share one listing instead of each fetching their own.
+    `filter_by` is applied server-side; build it with filters()
+    """
+    kwargs = {'PaginationConfig': {'PageSize': PAGE_SIZE}}
+    if filter_by:
+        kwargs[_FILTER_PARAM.get(operation, 'Filters')] = [
+            {'Name': name, 'Values': list(values)} for name, values in filter_by
+        ]
+    return client(service).get_paginator(operation).paginate(**kwargs).build_full_result()
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """
+    runs `fn` on the shared worker pool; create any client `fn` is bound
+    to before submitting, boto3 sessions aren't thread-safe
+    """
+    return _pool.submit(fn, *args, **kwargs)
+
+
+def prefetch_stack(name: str, logical_id: str) -> Tuple[Future, Future]:
+    """
+    starts describe_stacks and describe_stack_resources concurrently;
+    returns the (stack, resource) futures, whose result() raises like
+    the underlying call would
+    """
+    ttl = ttl_hash()
+    # create the client here: boto3 sessions aren't thread-safe
+    client('cloudformation')
+    return (_pool.submit(cached_describe_stack, name, ttl),
+            _pool.submit(cached_describe_stack_resources, name, logical_id, ttl))
@@ -1,5 +1,8 @@
-from datetime import datetime
-from random import Random
+from os import urandom
+from time import time_ns
+
+# Maps every byte to its low 6 bits (uniform bytes -> uniform 0..63)
+_LOW_6_BITS = bytes(b & 0x3F for b in range(256))
 
 
 class BetterGuid(object):
@@ -16,19 +19,19 @@ class BetterGuid(object):
     """
 
     def __init__(self):
-        self.random = Random()
-        self.push_characters = b"-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+        self.push_characters = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+        # maps random digits 0..63 straight to their push characters
+        self._push_table = bytes.maketrans(bytes(range(64)), self.push_characters.encode('ascii'))
         self.last_random_characters = bytearray(12)
         self.last_push_time = 0
         self.generate_random_part()
         assert len(self.push_characters) == 64
 
     def generate_random_part(self):
-        for i in range(0, 12):
-            self.last_random_characters[i] = self.random.randint(0, 63)
+        self.last_random_characters[:] = urandom(12).translate(_LOW_6_BITS)
 
     def new_guid(self):
-        result = bytearray(8 + 12)
+        result = [''] * 8
         time_in_ms = time_in_millis()
         if time_in_ms == self.last_push_time:
             for i in range(0, 12):
@@ -40,18 +43,16 @@ class BetterGuid(object):
             self.last_push_time = time_in_ms
             self.generate_random_part()
 
-        for i in range(0, 12):
-            result[19 - i] = self.push_characters[self.last_random_characters[i]]
-
         for i in range(7, -1, -1):
-            n = int(time_in_ms % 64)
+            time_in_ms, n = divmod(time_in_ms, 64)
             result[i] = self.push_characters[n]
-            time_in_ms = int(time_in_ms / 64)
-        return result.decode('ascii')
+        # random digits are stored least significant first, hence the reversal
+        random_part = self.last_random_characters.translate(self._push_table)[::-1]
+        return ''.join(result) + random_part.decode('ascii')
 
 
 def time_in_millis():
     """
     returns the current time in milliseconds
     """
-    return int(round(datetime.utcnow().timestamp() * 1000))
+    return time_ns() // 1_000_000
@@ -1,7 +1,8 @@
+import functools
 import importlib
 import importlib.util
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import click
 
@@ -20,11 +21,27 @@ def get_track_class(path: str) -> Any:
     return clazz
 
 
+@functools.lru_cache(maxsize=None)
+def list_track_names(track_dir: str) -> Tuple[str, ...]:
+    """
+    Returns the names of the available tracks, without importing them
+    """
+    return tuple(f for f in os.listdir(track_dir + '/tracks/') if f not in ['__init__.py', '__pycache__'])
+
+
+@functools.lru_cache(maxsize=None)
+def load_track(track_dir: str, name: str) -> Any:
+    """
+    Returns the class of a single track, importing only that track
+    """
+    return get_track_class(track_dir + '/tracks/' + str(name) + '/' + 'mytrack.py')
+
+
 def get_tracks(track_dir: str) -> Dict[str,  Any]:
     """
     Return an index of tracks with classes
     """
-    index = { f: get_track_class(track_dir + '/tracks/' + str(f) + '/' + 'mytrack.py') for f in os.listdir(track_dir + '/tracks/') if f not in ['__init__.py', '__pycache__']}
+    index = { f: load_track(track_dir, f) for f in list_track_names(track_dir)}
     return index
 
 
@@ -57,7 +74,7 @@ def main(track = '', action = '', verbose = False):
         exit()
 
     try:
-        track_class = get_tracks(script_directory).get(track)
+        track_class = load_track(script_directory, track) if track in list_track_names(script_directory) else None
         if track_class:
             cl = track_class(track)
             getattr(cl, action)()
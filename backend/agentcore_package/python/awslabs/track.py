@@ -1,4 +1,4 @@
-import boto3
+import functools
 import importlib
 import configparser
 import os
@@ -6,6 +6,9 @@ import click
 from awslabs.challenge import Challenge
 from awslabs.betterguid import BetterGuid
 
+_CONFIG_PATH = os.path.expanduser('~/.awslabs/config')
+_CONFIG_DIR = os.path.dirname(_CONFIG_PATH)
+
 
 def load_class(full_class_string):
     """
@@ -26,9 +29,16 @@ def challenge_id(var):
     return '{0}'.format(var.zfill(2))
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_challenge(track_id, challenge_id):
+    """
+    returns the MyChallenge class of a challenge module, cached per (track, challenge)
+    """
+    return importlib.import_module(f'awslabs.tracks.{track_id}.challenges.{challenge_id}').MyChallenge
+
+
 def load_challenge(track_id, track_name, challenge_id) -> Challenge:
-    clazz = load_class('awslabs.tracks.{}.challenges.{}.MyChallenge'.format(track_id, challenge_id))
-    return clazz(track_id, track_name)
+    return _resolve_challenge(track_id, challenge_id)(track_id, track_name)
 
 class Track(object):
 
@@ -39,9 +49,13 @@ class Track(object):
     def __init__(self, id):
         ''' test '''
         self.id = id
+        # parsed once; get() reads from memory, save()/delete() keep it in sync
+        self._config = configparser.ConfigParser()
+        self._config.read(_CONFIG_PATH)
 
     def start(self):
-        if self.get('current') is '0' or self.get('current') is '':
+        current = self.get('current', '0')
+        if current in ('0', ''):
             click.echo(click.style("\n# Track: {}\n".format(self.name), fg='red', bold=True))
             click.echo(self.description)
             challenge = load_challenge(self.id, self.name, '01')
@@ -83,13 +97,10 @@ class Track(object):
 
 
     def save(self, key, value):
-        file = '~/.awslabs/config'
-        filename = os.path.expanduser(file)
-        dirname = os.path.dirname(filename)
-        if not os.path.exists(dirname):
-            os.makedirs(dirname)
-        config = configparser.ConfigParser()
-        config.read(filename)
+        os.makedirs(_CONFIG_DIR, exist_ok=True)
+        config = self._config
+        # re-read so values a challenge saved in the meantime are not lost
+        config.read(_CONFIG_PATH)
 
         # if section does not exist
         if not config.has_section(self.id):
@@ -97,17 +108,11 @@ class Track(object):
 
         # add the key and write the file
         config.set(self.id, key, str(value))
-        with open(filename, 'w') as fp:
+        with open(_CONFIG_PATH, 'w') as fp:
             config.write(fp)
 
     def get(self, key, default = ''):
-        file = '~/.awslabs/config'
-        filename = os.path.expanduser(file)
-        dirname = os.path.dirname(filename)
-        if not os.path.exists(dirname):
-            os.makedirs(dirname)
-        config = configparser.ConfigParser()
-        config.read(filename)
+        config = self._config
         if self.id in config.sections():
             if key in config[self.id]:
                 return config[self.id][key]
@@ -117,12 +122,10 @@ class Track(object):
             return default
 
     def delete(self):
-        file = '~/.awslabs/config'
-        filename = os.path.expanduser(file)
-        config = configparser.ConfigParser()
-        config.read(filename)
+        config = self._config
+        config.read(_CONFIG_PATH)
         config.remove_section(self.id)
-        with open(filename, 'w') as fp:
+        with open(_CONFIG_PATH, 'w') as fp:
             config.write(fp)
 
     def stop(self):
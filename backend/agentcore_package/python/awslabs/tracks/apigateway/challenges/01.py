@@ -1,6 +1,6 @@
 from typing import List
+from awslabs._awscache import client as aws_client
 from awslabs.challenge import Challenge
-import boto3
 
 class MyChallenge(Challenge):
     """The first challenge in this track is to create an API Gateway RestAPI
@@ -27,7 +27,7 @@ Tips & Links:
 
 
 def validate_apigw() -> List[str]:
-    client = boto3.client('apigateway')
+    client = aws_client('apigateway')
     xs = [item for item in list(client.get_rest_apis()['items']) if item['name'] == 'myApi']
     if len(xs) == 0:
         return ['No RestApi with the name `myApi` found']
@@ -36,7 +36,7 @@ def validate_apigw() -> List[str]:
 
 
 def validate_cf() -> List[str]:
-    client = boto3.client('cloudformation')
+    client = aws_client('cloudformation')
     xs = [item for item in list(client.list_stacks()['StackSummaries']) if item['StackName'] == 'awslabs' and item['StackStatus'] == 'CREATE_COMPLETE']
     if len(xs) == 0:
         return ['No CloudFormation stack with the name `awslabs` found']
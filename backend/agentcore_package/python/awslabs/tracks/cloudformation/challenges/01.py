@@ -1,9 +1,9 @@
 from awslabs.challenge import Challenge
-import boto3
-import yaml
+from awslabs._awscache import cached_describe_instance, prefetch_stack, ttl_hash
 import os
 import click
-from cfn_tools.yaml_loader import CfnYamlLoader, ODict
+from cfn_tools.yaml_loader import ODict
+from awslabs.tracks.cloudformation.template import load_template
 
 class MyChallenge(Challenge):
 
@@ -24,60 +24,52 @@ class MyChallenge(Challenge):
 
     def validate(self):
         if os.path.isfile('./template.yaml'):
-            with open('./template.yaml', 'r') as f:
+            try:
+                doc = load_template('./template.yaml', required=('Ec2Instance', 'InstanceType', 'ImageId'))
+            except:
+                return self.fail("Failed to load your template.yaml")
+            if doc is None:
+                return self.fail("No valid yaml!")
+            else:
                 try:
-                    doc = yaml.load(f, Loader=CfnYamlLoader)
+                    it = doc['Resources']['Ec2Instance']['Properties']['InstanceType']
+                    ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
+                    self.debug('Found the resource and properties in the template.')
                 except:
-                    return self.fail("Failed to load your template.yaml")
-                if doc is None:
-                    return self.fail("No valid yaml!")
+                    return self.fail("Cannot find the Ec2Instance Resource in the template.")  
+                    
+                if it != 't2.small':
+                    return self.fail("InstanceType is not t2.small")
+                elif ami != 'ami-d834aba1':
+                    return self.fail("ImageId is not ami-d834aba1")
                 else:
+                    # stack and resource are independent lookups, fetch them together
+                    stack_future, resource_future = prefetch_stack('awslabs', 'Ec2Instance')
                     try:
-                        it = doc['Resources']['Ec2Instance']['Properties']['InstanceType']
-                        ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
-                        self.debug('Found the resource and properties in the template.')
+                        # Filter on created (non deleted etc)
+                        stack = stack_future.result()
+                        self.debug('Found the awslabs stack in AWS.')
                     except:
-                        return self.fail("Cannot find the Ec2Instance Resource in the template.")  
-                    
-                    if it != 't2.small':
-                        return self.fail("InstanceType is not t2.small")
-                    elif ami != 'ami-d834aba1':
-                        return self.fail("ImageId is not ami-d834aba1")
-                    else:
-                        client = boto3.client('cloudformation')
-                        try:
-                            # Filter on created (non deleted etc)
-                            stack = client.describe_stacks(
-                                StackName='awslabs'
-                            )
-                            self.debug('Found the awslabs stack in AWS.')
-                        except:
-                            return self.fail("Stack awslabs not deployed.")
+                        return self.fail("Stack awslabs not deployed.")
                         
-                        try:
-                            resource = client.describe_stack_resources(
-                                StackName='awslabs',
-                                LogicalResourceId='Ec2Instance'
-                            )
-                            instance_id = resource['StackResources'][0]['PhysicalResourceId']
-                            self.debug('Found the PhysicalResourceId of the instance.')
-                        except:
-                            return self.fail("Stack does not contain a resource Ec2Instance.")
+                    try:
+                        resource = resource_future.result()
+                        instance_id = resource['StackResources'][0]['PhysicalResourceId']
+                        self.debug('Found the PhysicalResourceId of the instance.')
+                    except:
+                        return self.fail("Stack does not contain a resource Ec2Instance.")
 
-                        # instance check
-                        try:
-                            ec2 = boto3.client('ec2')
-                            instance = ec2.describe_instances(
-                                InstanceIds=[instance_id]
-                            )
-                            self.debug('Found the instance in Ec2 environment.')
-                        except:
-                            return self.fail("Cannot find the instance.")
+                    # instance check
+                    try:
+                        instance = cached_describe_instance(instance_id, ttl_hash())
+                        self.debug('Found the instance in Ec2 environment.')
+                    except:
+                        return self.fail("Cannot find the instance.")
 
-                        if not instance['Reservations'][0]['Instances'][0]['ImageId'] == 'ami-d834aba1':
-                            return self.fail("Deployed instance has a wrong ImageId")
-                        else:
-                            return self.success("You deployed the instance with cloudformation!")
+                    if not instance['Reservations'][0]['Instances'][0]['ImageId'] == 'ami-d834aba1':
+                        return self.fail("Deployed instance has a wrong ImageId")
+                    else:
+                        return self.success("You deployed the instance with cloudformation!")
         else:
             return self.fail("Cannot find template.yaml")
 
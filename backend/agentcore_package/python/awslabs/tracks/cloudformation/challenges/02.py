@@ -1,9 +1,13 @@
 from awslabs.challenge import Challenge
-import boto3
+from awslabs._awscache import cached_describe_instance, prefetch_stack, ttl_hash
 import os
-import yaml
 import click
-from cfn_tools.yaml_loader import CfnYamlLoader, ODict
+from cfn_tools.yaml_loader import ODict
+from awslabs.tracks.cloudformation.template import load_template
+
+# accepted forms of the ImageId reference, built once
+_REF_AMI = (ODict([('Fn::Ref:', 'AmiId')]), ODict([('Ref', 'AmiId')]))
+
 
 class MyChallenge(Challenge):
 
@@ -24,61 +28,53 @@ class MyChallenge(Challenge):
 
     def validate(self):
         if os.path.isfile('./template.yaml'):
-            with open('./template.yaml', 'r') as f:
+            try:
+                doc = load_template('./template.yaml', required=('AmiId', 'Ec2Instance', 'InstanceType', 'ImageId'))
+            except:
+                return self.fail("Failed to load your template.yaml")
+            if doc is None:
+                return self.fail("No valid yaml!")
+            else:  
                 try:
-                    doc = yaml.load(f, Loader=CfnYamlLoader)
+                    param_type = doc['Parameters']['AmiId']['Type']
+                    it = doc['Resources']['Ec2Instance']['Properties']['InstanceType']
+                    ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
+                    click.echo('template.yaml looks valid')
                 except:
-                    return self.fail("Failed to load your template.yaml")
-                if doc is None:
-                    return self.fail("No valid yaml!")
-                else:  
+                    return self.fail("Your template.yaml contains errors.")
+
+                if it != 't2.small':
+                    return self.fail("InstanceType is not t2.small and/or ImageId has no !Ref function")  
+                elif ami not in _REF_AMI:
+                    return self.fail("ImageId has no !Ref function")  
+                else:
+                    # stack and resource are independent lookups, fetch them together
+                    stack_future, resource_future = prefetch_stack('awslabs', 'Ec2Instance')
+                    # stack
                     try:
-                        param_type = doc['Parameters']['AmiId']['Type']
-                        it = doc['Resources']['Ec2Instance']['Properties']['InstanceType']
-                        ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
-                        click.echo('template.yaml looks valid')
+                        stack = stack_future.result()
+                        click.echo('found the stack!')
                     except:
-                        return self.fail("Your template.yaml contains errors.")
-
-                    if it != 't2.small':
-                        return self.fail("InstanceType is not t2.small and/or ImageId has no !Ref function")  
-                    elif ami != ODict([('Fn::Ref:', 'AmiId')]) and ami != ODict([('Ref', 'AmiId')]):
-                        return self.fail("ImageId has no !Ref function")  
-                    else:
-                        # stack
-                        client = boto3.client('cloudformation')
-                        try:
-                            stack = client.describe_stacks(
-                                StackName='awslabs'
-                            )
-                            click.echo('found the stack!')
-                        except:
-                            return self.fail("Stack awslabs not deployed.")
+                        return self.fail("Stack awslabs not deployed.")
                         
-                        # resource
-                        try:
-                            resource = client.describe_stack_resources(
-                                StackName='awslabs',
-                                LogicalResourceId='Ec2Instance'
-                            )
-                            instance_id = resource['StackResources'][0]['PhysicalResourceId']
-                            click.echo('found the resource!')
-                        except:
-                            return self.fail("Stack does not contain a resource Ec2Instance.")
+                    # resource
+                    try:
+                        resource = resource_future.result()
+                        instance_id = resource['StackResources'][0]['PhysicalResourceId']
+                        click.echo('found the resource!')
+                    except:
+                        return self.fail("Stack does not contain a resource Ec2Instance.")
                         
-                        # instance check
-                        try:
-                            ec2 = boto3.client('ec2')
-                            instance = ec2.describe_instances(
-                                InstanceIds=[instance_id]
-                            )
-                            click.echo('found the instance!')
-                        except:
-                            return self.fail("Cannot find the instance.")
+                    # instance check
+                    try:
+                        instance = cached_describe_instance(instance_id, ttl_hash())
+                        click.echo('found the instance!')
+                    except:
+                        return self.fail("Cannot find the instance.")
 
-                        if not instance['Reservations'][0]['Instances'][0]['ImageId'] == 'ami-d834aba1':
-                            return self.fail("Deployed instance has a wrong ImageId")
-                        else:
-                            return self.success("You deployed the correct ami, with the correct parameter!")
+                    if not instance['Reservations'][0]['Instances'][0]['ImageId'] == 'ami-d834aba1':
+                        return self.fail("Deployed instance has a wrong ImageId")
+                    else:
+                        return self.success("You deployed the correct ami, with the correct parameter!")
         else:
             return self.fail("Cannot find template.yaml")
\ No newline at end of file
@@ -1,9 +1,19 @@
 from awslabs.challenge import Challenge
-import boto3
+from awslabs._awscache import cached_describe_instance, prefetch_stack, ttl_hash
 import os
-import yaml
 import click
-from cfn_tools.yaml_loader import CfnYamlLoader, ODict
+from cfn_tools.yaml_loader import ODict
+from awslabs.tracks.cloudformation.template import load_template
+
+# accepted forms (long and short function syntax), built once
+_USE_CUSTOM_AMI_CONDITIONS = (
+    ODict([('Fn::Not', [ODict([('Fn::Equals', [ODict([('Ref', 'CustomAmiId')]), ''])])])]),
+    ODict([('Fn::Not', [ODict([('Fn::Equals', ['Ref CustomAmiId', ''])])])]),
+)
+_IF_CUSTOM_AMI = (
+    ODict([('Fn::If', ['UseCustomAmi', ODict([('Ref', 'CustomAmiId')]), ODict([('Ref', 'LatestAmiId')])])]),
+    ODict([('Fn::If', ['UseCustomAmi', 'Ref CustomAmiId', 'Ref LatestAmiId'])]),
+)
 
 
 class MyChallenge(Challenge):
@@ -29,72 +39,60 @@ class MyChallenge(Challenge):
     def validate(self):
 
         if os.path.isfile('./template.yaml'):
-            with open('./template.yaml', 'r') as f:
+            try:
+                doc = load_template('./template.yaml', required=('LatestAmiId', 'CustomAmiId', 'UseCustomAmi', 'Ec2Instance', 'ImageId'))
+            except:
+                return self.fail("Failed to load your template.yaml")
+            if doc is None:
+                return self.fail("No valid yaml!")
+            else:
                 try:
-                    doc = yaml.load(f, Loader=CfnYamlLoader)
+                    latest = doc['Parameters']['LatestAmiId']['Type']
+                    custom = doc['Parameters']['CustomAmiId']['Type']
+                    condition = doc['Conditions']['UseCustomAmi']
+                    ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
+                    click.echo('template.yaml looks valid')
                 except:
-                    return self.fail("Failed to load your template.yaml")
-                if doc is None:
-                    return self.fail("No valid yaml!")
-                else:
-                    try:
-                        latest = doc['Parameters']['LatestAmiId']['Type']
-                        custom = doc['Parameters']['CustomAmiId']['Type']
-                        condition = doc['Conditions']['UseCustomAmi']
-                        ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
-                        click.echo('template.yaml looks valid')
-                    except:
-                        return self.fail("Your template.yaml contains errors.")
+                    return self.fail("Your template.yaml contains errors.")
                     
-                    # is condition ok?
-                    if ( condition != ODict([('Fn::Not', [ODict([('Fn::Equals', [ODict([('Ref', 'CustomAmiId')]), ''])])])]) and
-                         condition != ODict([('Fn::Not', [ODict([('Fn::Equals', ['Ref CustomAmiId', ''])])])])
-                    ):
-                        return self.fail("Condition is not correctly configured.")
+                # is condition ok?
+                if condition not in _USE_CUSTOM_AMI_CONDITIONS:
+                    return self.fail("Condition is not correctly configured.")
 
-                    # is imageId ok?
-                    if ( ami != ODict([('Fn::If', ['UseCustomAmi', ODict([('Ref', 'CustomAmiId')]), ODict([('Ref', 'LatestAmiId')])])]) and 
-                         ami != ODict([('Fn::If', ['UseCustomAmi', 'Ref CustomAmiId', 'Ref LatestAmiId'])])
-                    ):
-                        return self.fail("The If statement in ImageID is not correctly configured.")
+                # is imageId ok?
+                if ami not in _IF_CUSTOM_AMI:
+                    return self.fail("The If statement in ImageID is not correctly configured.")
 
-                    # stack
-                    client = boto3.client('cloudformation')
-                    try:
-                        stack = client.describe_stacks(
-                            StackName='awslabs'
-                        )
-                        if stack['Stacks'][0]['Parameters'][0]['ParameterKey'] == "CustomAmiId":
-                            param_ami = stack['Stacks'][0]['Parameters'][0]['ParameterValue']
-                        else:
-                            param_ami = stack['Stacks'][0]['Parameters'][1]['ParameterValue']
-                        click.echo('found the stack!')
-                    except:
-                        return self.fail("Stack awslabs not deployed.")
+                # stack and resource are independent lookups, fetch them together
+                stack_future, resource_future = prefetch_stack('awslabs', 'Ec2Instance')
+                # stack
+                try:
+                    stack = stack_future.result()
+                    if stack['Stacks'][0]['Parameters'][0]['ParameterKey'] == "CustomAmiId":
+                        param_ami = stack['Stacks'][0]['Parameters'][0]['ParameterValue']
+                    else:
+                        param_ami = stack['Stacks'][0]['Parameters'][1]['ParameterValue']
+                    click.echo('found the stack!')
+                except:
+                    return self.fail("Stack awslabs not deployed.")
                     
-                    # resource
-                    try:
-                        resource = client.describe_stack_resources(
-                            StackName='awslabs',
-                            LogicalResourceId='Ec2Instance'
-                        )
-                        instance_id = resource['StackResources'][0]['PhysicalResourceId']
-                        click.echo('found the resource! ({})'.format(instance_id))
-                    except:
-                        return self.fail("Stack does not contain a resource Ec2Instance.")
+                # resource
+                try:
+                    resource = resource_future.result()
+                    instance_id = resource['StackResources'][0]['PhysicalResourceId']
+                    click.echo('found the resource! ({})'.format(instance_id))
+                except:
+                    return self.fail("Stack does not contain a resource Ec2Instance.")
                     
-                    # instance check
-                    try:
-                        ec2 = boto3.client('ec2')
-                        instance = ec2.describe_instances(
-                            InstanceIds=[instance_id]
-                        )
-                    except:
-                        return self.fail("Cannot find the instance.")
+                # instance check
+                try:
+                    instance = cached_describe_instance(instance_id, ttl_hash())
+                except:
+                    return self.fail("Cannot find the instance.")
 
-                    if not instance['Reservations'][0]['Instances'][0]['ImageId'] == param_ami:
-                        return self.fail("Deployed instance has a wrong ImageId")
-                    else:
-                        return self.success("You deployed the correct ami, with the correct parameter!")
+                if not instance['Reservations'][0]['Instances'][0]['ImageId'] == param_ami:
+                    return self.fail("Deployed instance has a wrong ImageId")
+                else:
+                    return self.success("You deployed the correct ami, with the correct parameter!")
         else:
             return self.fail("Cannot find template.yaml")
\ No newline at end of file
@@ -1,9 +1,13 @@
 from awslabs.challenge import Challenge
-import boto3
+from awslabs._awscache import cached_describe_instance, prefetch_stack, ttl_hash
 import os
-import yaml
 import click
-from cfn_tools.yaml_loader import CfnYamlLoader, ODict
+from cfn_tools.yaml_loader import ODict
+from awslabs.tracks.cloudformation.template import load_template
+
+# accepted forms of the references, built once
+_REF_SECURITY_GROUP = (ODict([('Fn::Ref:', 'SecurityGroup')]), ODict([('Ref', 'SecurityGroup')]))
+_GETATT_GROUP_ID = ODict([('Fn::GetAtt', ['SecurityGroup', 'GroupId'])])
 
 
 class MyChallenge(Challenge):
@@ -31,64 +35,56 @@ class MyChallenge(Challenge):
     def validate(self):
     
         if os.path.isfile('./template.yaml'):
-            with open('./template.yaml', 'r') as f:
+            try:
+                doc = load_template('./template.yaml', required=('SecurityGroupId', 'SecurityGroups', 'GroupDescription', 'Ec2Instance', 'ImageId'))
+            except:
+                return self.fail("Failed to load your template.yaml")
+            if doc is None:
+                return self.fail("No valid yaml!")
+            else:
                 try:
-                    doc = yaml.load(f, Loader=CfnYamlLoader)
+                    ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
+                    output = doc['Outputs']['SecurityGroupId']['Value']
+                    sg = doc['Resources']['Ec2Instance']['Properties']['SecurityGroups'][0]
+                    gd = doc['Resources']['SecurityGroup']['Properties']['GroupDescription']
+                    click.echo('template.yaml looks valid')
                 except:
-                    return self.fail("Failed to load your template.yaml")
-                if doc is None:
-                    return self.fail("No valid yaml!")
+                    return self.fail("Your template.yaml is not configured correctly. Fix it and try again.")
+                    
+                if sg not in _REF_SECURITY_GROUP:
+                    return self.fail("Use Ref to use ref the SecurityGroup")
+                elif output != _GETATT_GROUP_ID:
+                    return self.fail("Ouptut has no correct GetAtt function")
                 else:
+                    # stack and resource are independent lookups, fetch them together
+                    stack_future, resource_future = prefetch_stack('awslabs', 'Ec2Instance')
+                    # stack
                     try:
-                        ami = doc['Resources']['Ec2Instance']['Properties']['ImageId']
-                        output = doc['Outputs']['SecurityGroupId']['Value']
-                        sg = doc['Resources']['Ec2Instance']['Properties']['SecurityGroups'][0]
-                        gd = doc['Resources']['SecurityGroup']['Properties']['GroupDescription']
-                        click.echo('template.yaml looks valid')
+                        stack = stack_future.result()
+                        cfn_output_sg = stack['Stacks'][0]['Outputs'][0]['OutputValue']
+                        click.echo('found the stack!')
                     except:
-                        return self.fail("Your template.yaml is not configured correctly. Fix it and try again.")
-                    
-                    if sg != ODict([('Fn::Ref:', 'SecurityGroup')]) and sg != ODict([('Ref', 'SecurityGroup')]):
-                        return self.fail("Use Ref to use ref the SecurityGroup")
-                    elif output != ODict([('Fn::GetAtt', ['SecurityGroup', 'GroupId'])]):
-                        return self.fail("Ouptut has no correct GetAtt function")
-                    else:
-                        # stack
-                        client = boto3.client('cloudformation')
-                        try:
-                            stack = client.describe_stacks(
-                                StackName='awslabs'
-                            )
-                            cfn_output_sg = stack['Stacks'][0]['Outputs'][0]['OutputValue']
-                            click.echo('found the stack!')
-                        except:
-                            return self.fail("Stack awslabs is not deployed, still updating or incorrect.")
+                        return self.fail("Stack awslabs is not deployed, still updating or incorrect.")
 
-                        # resource
-                        try:
-                            resource = client.describe_stack_resources(
-                                StackName='awslabs',
-                                LogicalResourceId='Ec2Instance'
-                            )
-                            instance_id = resource['StackResources'][0]['PhysicalResourceId']
-                            click.echo('found the resource! ({})'.format(instance_id))
-                        except:
-                            return self.fail("Stack does not contain a resource Ec2Instance.")
+                    # resource
+                    try:
+                        resource = resource_future.result()
+                        instance_id = resource['StackResources'][0]['PhysicalResourceId']
+                        click.echo('found the resource! ({})'.format(instance_id))
+                    except:
+                        return self.fail("Stack does not contain a resource Ec2Instance.")
                         
-                        # instance check
-                        try:
-                            ec2 = boto3.client('ec2')
-                            instance = ec2.describe_instances(
-                                InstanceIds=[instance_id]
-                            )
-                            instance_sg_id = instance['Reservations'][0]['Instances'][0]['SecurityGroups'][0]['GroupId']
-                        except:
-                            return self.fail("Cannot find the instance.")
+                    # instance check
+                    try:
+                        instance = cached_describe_instance(instance_id, ttl_hash())
+                        instance_sg_id = instance['Reservations'][0]['Instances'][0]['SecurityGroups'][0]['GroupId']
+                    except:
+                        return self.fail("Cannot find the instance.")
 
-                        # does the instance have the right sg
-                        if instance_sg_id != cfn_output_sg:
-                            return self.fail("Deployed instance has a wrong SecurityGroupId")
-                        else:
-                            return self.success("Stack has been deployed, with the correct SecurityGroup!")
+                    # does the instance have the right sg
+                    if instance_sg_id != cfn_output_sg:
+                        return self.fail("Deployed instance has a wrong SecurityGroupId")
+                    else:
+                        return self.success("Stack has been deployed, with the correct SecurityGroup!")
         else:
             return self.fail("Cannot find template.yaml")
\ No newline at end of file
@@ -0,0 +1,48 @@
+import os
+from typing import Tuple
+
+import yaml
+from cfn_tools.yaml_loader import CfnYamlLoader, ODict
+
+try:
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:
+    _BaseLoader = None
+
+if _BaseLoader is not None:
+    class CfnLoader(_BaseLoader):
+        """
+        CfnYamlLoader on top of libyaml: same constructors (ODict maps,
+        !Ref / !GetAtt style tags), C scanner and parser
+        """
+    CfnLoader.yaml_constructors = CfnYamlLoader.yaml_constructors.copy()
+    CfnLoader.yaml_multi_constructors = CfnYamlLoader.yaml_multi_constructors.copy()
+else:
+    CfnLoader = CfnYamlLoader
+
+_templates = {}
+
+
+def load_template(path: str = './template.yaml', required: Tuple[str, ...] = ()):
+    """
+    parses a cloudformation template, reusing the previous parse while
+    the file is unchanged (same mtime and size)
+
+    `required` names keys the caller is going to look up. If any of them
+    does not occur anywhere in the file the lookups are bound to fail, so
+    the yaml parse is skipped and an empty template is returned.
+
+    raises OSError if the file cannot be read and yaml.YAMLError if it
+    is not valid yaml
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _templates.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, 'rb') as f:
+            content = f.read()
+        if not all(key.encode('utf-8') in content for key in required):
+            return ODict()
+        cached = _templates[path] = (stamp, yaml.load(content, Loader=CfnLoader))
+    return cached[1]
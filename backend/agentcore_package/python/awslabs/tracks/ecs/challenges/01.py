@@ -1,5 +1,4 @@
-import boto3
-
+from awslabs._awscache import client
 from awslabs.challenge import Challenge, UnfinishedChallengeException
 
 
@@ -16,7 +15,7 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        ecr = boto3.client('ecr')
+        ecr = client('ecr')
         try:
             ecr.describe_repositories(repositoryNames=["paas-monitor"])
             self.success('ECR repository "paas-monitor found.')
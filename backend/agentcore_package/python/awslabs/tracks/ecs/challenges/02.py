@@ -1,13 +1,11 @@
-import boto3
 import docker
 
+from awslabs._awscache import client
 from awslabs.challenge import Challenge
 from awslabs.tracks.ecs.docker_registry import get_docker_registry
 
 IMAGE_NAME = 'mvanholsteijn/paas-monitor:latest'
 
-ecr = boto3.client('ecr')
-
 
 class MyChallenge(Challenge):
     """
@@ -29,6 +27,7 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
+        ecr = client('ecr')
         try:
             dckr = docker.from_env()
             image = dckr.images.get(IMAGE_NAME)
@@ -1,5 +1,4 @@
-import boto3
-
+from awslabs._awscache import client
 from awslabs.challenge import Challenge
 from awslabs.tracks.ecs.docker_registry import get_docker_registry
 
@@ -19,8 +18,8 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        ecs = boto3.client('ecs')
-        ecr = boto3.client('ecr')
+        ecs = client('ecs')
+        ecr = client('ecr')
         response = ecs.list_task_definitions(
             familyPrefix='paas-monitor', sort='DESC')
         task_definitions = map(
@@ -1,5 +1,4 @@
-import boto3
-
+from awslabs._awscache import client
 from awslabs.challenge import Challenge, UnfinishedChallengeException
 
 
@@ -15,15 +14,11 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        ecs = boto3.client('ecs')
+        ecs = client('ecs')
+        # the cluster name is the last segment of its ARN, no describe needed
+        suffix = '/awslabs-cluster'
         for response in ecs.get_paginator('list_clusters').paginate():
-            response = ecs.list_clusters()
-            cluster = next(
-                filter(
-                    lambda c: c['clusterName'] == 'awslabs-cluster',
-                    ecs.describe_clusters(
-                        clusters=response['clusterArns'])['clusters']), None)
-            if cluster:
+            if any(arn.endswith(suffix) for arn in response['clusterArns']):
                 self.success('ECS cluster "awslabs-cluster" was found')
                 return True
 
@@ -1,9 +1,16 @@
-import boto3
 import requests
 from botocore.exceptions import ClientError
 
+from awslabs._awscache import cached_describe_service, client, submit, ttl_hash
 from awslabs.tracks.ecs.challenges.create_service import MyChallenge as CreateServiceChallenge
 
+# reused so repeated validations keep the connection to the load balancer
+_HTTP = requests.Session()
+
+# (connect, read) seconds: an unreachable load balancer fails fast, a slow
+# service still gets time to answer
+PROBE_TIMEOUT = (1, 2)
+
 
 class MyChallenge(CreateServiceChallenge):
     """
@@ -24,8 +31,13 @@ class MyChallenge(CreateServiceChallenge):
     description = __doc__
 
     def validate(self):
-        elbv2 = boto3.client('elbv2')
-        ecs = boto3.client('ecs')
+        elbv2 = client('elbv2')
+        # create the client here: boto3 sessions aren't thread-safe
+        client('ecs')
+        # the service lookup doesn't depend on the load balancer chain below;
+        # it is shared with CreateServiceChallenge.validate
+        services_future = submit(cached_describe_service,
+                                 'awslabs-cluster', 'paas-monitor', ttl_hash())
         try:
             response = elbv2.describe_load_balancers(
                 Names=['awslabs-cluster-lb'])
@@ -37,6 +49,11 @@ class MyChallenge(CreateServiceChallenge):
         lb = response['LoadBalancers'][0]
         lb_arn = lb['LoadBalancerArn']
 
+        # probe the load balancer while the remaining describes run; its
+        # result is only looked at once every other check has passed
+        url = 'http://{}'.format(lb['DNSName'])
+        probe_future = submit(_HTTP.get, url + '/status', timeout=PROBE_TIMEOUT)
+
         try:
             listeners = elbv2.describe_listeners(
                 LoadBalancerArn=lb_arn)['Listeners']
@@ -60,9 +77,7 @@ class MyChallenge(CreateServiceChallenge):
             )
 
         try:
-            services = ecs.describe_services(
-                cluster='awslabs-cluster',
-                services=['paas-monitor'])['services']
+            services = services_future.result()['services']
         except ClientError as e:
             self.fail(
                 'service "paas-monitor" not found on cluster "awslabs-cluster".'
@@ -74,17 +89,13 @@ class MyChallenge(CreateServiceChallenge):
             )
 
         service = services[0]
-        target_group_arns = set(
-            map(lambda lb: lb['targetGroupArn'], service['loadBalancers']))
+        target_group_arns = {lb['targetGroupArn'] for lb in service['loadBalancers']}
         if not target_group_arns:
             self.fail(
                 'service "paas-monitor" is not associated with any TargetGroups'
             )
 
-        rule_matches = filter(lambda rule: filter(
-            lambda action: 'TargetGroupArn' in action and action['TargetGroupArn'] in target_group_arns,
-            rule['Actions']), rules)
-        if not rule_matches:
+        if not forwards_to_any(rules, target_group_arns):
             self.fail(
                 'no rules on the port 80 listener forward to the target group target {} of the service "paas-monitor"'
                 .format(target_group_arns))
@@ -94,9 +105,8 @@ class MyChallenge(CreateServiceChallenge):
                 'expected at least two instances of the service "paas-monitor" are running, found {}'
                 .format(service['desiredCount']))
 
-        url = 'http://{}'.format(lb['DNSName'])
         try:
-            response = requests.get(url + '/status', timeout=3)
+            response = probe_future.result()
         except Exception as e:
             self.fail('Failed to connect to {}\n\t{}'.format(url, e))
 
@@ -107,3 +117,16 @@ class MyChallenge(CreateServiceChallenge):
         self.success(
             'The load balancer is forwarding to the paas-monitor service. goto {}'
             .format(url))
+
+
+def forwards_to_any(rules, target_group_arns):
+    """
+    True if an action of one of the listener `rules` forwards to one of
+    `target_group_arns`
+    """
+    for rule in rules:
+        for action in rule['Actions']:
+            arn = action.get('TargetGroupArn')
+            if arn is not None and arn in target_group_arns:
+                return True
+    return False
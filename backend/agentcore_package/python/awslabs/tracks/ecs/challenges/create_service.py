@@ -1,11 +1,7 @@
-import boto3
-
+from awslabs._awscache import cached_describe_service, client, ttl_hash
 from awslabs.challenge import Challenge
 from awslabs.tracks.ecs.docker_registry import get_docker_registry
 
-ecs = boto3.client('ecs')
-ecr = boto3.client('ecr')
-
 DOCKER_IMAGE = 'mvanholsteijn/paas-monitor:latest'
 
 
@@ -21,8 +17,9 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        response = ecs.describe_services(
-            cluster='awslabs-cluster', services=['paas-monitor'])
+        ecs = client('ecs')
+        ecr = client('ecr')
+        response = cached_describe_service('awslabs-cluster', 'paas-monitor', ttl_hash())
         service = response['services'][0] if response['services'] else None
         if not service:
             self.fail(
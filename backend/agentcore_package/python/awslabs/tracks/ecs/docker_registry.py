@@ -1,4 +1,5 @@
-import boto3
+import functools
+
 import docker
 from urllib.parse import urlparse
 from base64 import b64decode
@@ -32,9 +33,11 @@ def ecr_docker_login(ecr, docker_client):
     return result['Status'] == 'Login Succeeded'
 
 
+@functools.lru_cache(maxsize=None)
 def get_docker_registry(ecr):
     """
-    returns the ECR registry name
+    returns the ECR registry name, cached per client: the registry of an
+    account and region doesn't change, so only the first call fetches a token
     :param ecr: boto3 ECR client
     """
     _, _, registry = ecr_credentials(ecr)
@@ -1,5 +1,4 @@
 from awslabs.challenge import Challenge
-import boto3
 import yaml
 import os
 import click
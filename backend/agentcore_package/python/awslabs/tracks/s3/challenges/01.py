@@ -1,5 +1,5 @@
+from awslabs._awscache import client as aws_client
 from awslabs.challenge import Challenge
-import boto3
 
 class MyChallenge(Challenge):
 
@@ -20,7 +20,7 @@ class MyChallenge(Challenge):
 
     def validate(self):
 
-        client = boto3.client('s3')
+        client = aws_client('s3')
         buckets = client.list_buckets()
         object_found = False
         usedbucket = ""
@@ -1,5 +1,5 @@
+from awslabs._awscache import client as aws_client
 from awslabs.challenge import Challenge
-import boto3
 
 class MyChallenge(Challenge):
     title = "A Static Website with S3"
@@ -17,7 +17,7 @@ class MyChallenge(Challenge):
 
     def validate(self):
 
-        client = boto3.client('s3')
+        client = aws_client('s3')
 
         bucket_is_website = False
         response = client.get_bucket_website(
@@ -1,4 +1,4 @@
-import boto3
+from awslabs._awscache import cached_describe_all, filters, ttl_hash
 from awslabs.challenge import Challenge
 
 
@@ -30,9 +30,10 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        client = boto3.client('ec2')
+        ttl = ttl_hash()
 
-        vpc = vpc_with_name(client, "awslabs")
+        vpcs = cached_describe_all('ec2', 'describe_vpcs', ttl, filters({'tag:Name': ["awslabs"]}))["Vpcs"]
+        vpc = vpc_with_name(vpcs, "awslabs")
 
         if not vpc:
             self.fail("No VPC with name 'awslabs' was found. (Hint: provide the name as a tag.)")
@@ -40,7 +41,9 @@ class MyChallenge(Challenge):
         if vpc["CidrBlockAssociationSet"][0]["CidrBlock"] != "10.0.0.0/16":
             self.fail("You have a VPC, but it's missing the right subnet (10.0.0.0/16).")
 
-        igw = internet_gateway(client, vpc)
+        igws = cached_describe_all('ec2', 'describe_internet_gateways', ttl,
+                                   filters({'attachment.vpc-id': [vpc["VpcId"]]}))["InternetGateways"]
+        igw = internet_gateway(igws, vpc)
         if not igw:
             self.fail("No Internet Gateway is connected to your VPC.")
 
@@ -50,27 +53,15 @@ class MyChallenge(Challenge):
         self.success("You created a VPC with internet gateway.")
 
 
-def internet_gateway(client, vpc):
+def internet_gateway(igws, vpc):
     vpc_id = vpc["VpcId"]
-    igws = client.describe_internet_gateways()["InternetGateways"]
     for igw in igws:
         if igw["Attachments"][0]["VpcId"] == vpc_id:
             return igw
 
 
-def vpc_with_name(client, name):
-    vpcs = client.describe_vpcs()["Vpcs"]
-    return find_by_tags(vpcs, Name="awslabs")
-
-
-def find_by_tags(items, **kwargs):
-    for item in items:
-        if kwargs.items() <= tags(item):
-            return item
-
-
-def tags(item):
-    tags = {}
-    for tag in item.get("Tags", []):
-        tags[tag["Key"]] = tag["Value"]
-    return tags.items()
+def vpc_with_name(vpcs, name):
+    for vpc in vpcs:
+        for tag in vpc.get("Tags", ()):
+            if tag["Key"] == "Name" and tag["Value"] == name:
+                return vpc
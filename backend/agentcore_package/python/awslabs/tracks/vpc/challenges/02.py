@@ -1,4 +1,4 @@
-import boto3
+from awslabs._awscache import cached_describe_all, filters, ttl_hash
 from awslabs.challenge import Challenge
 
 
@@ -29,10 +29,14 @@ class MyChallenge(Challenge):
     ]
 
     def validate(self):
-        client = boto3.client("ec2")
         vpc_id = self.get("vpc_id")
 
-        subnets = [subnet(client, vpc_id, cidr) for cidr in self.cidrs]
+        # a single request covers all four subnets; the filter pins the VPC,
+        # so the CIDR alone identifies each one
+        found = cached_describe_all('ec2', 'describe_subnets', ttl_hash(),
+                                    filters({'vpc-id': [vpc_id], 'cidr-block': self.cidrs}))["Subnets"]
+        by_cidr = {s["CidrBlock"]: s for s in found}
+        subnets = [by_cidr.get(cidr) for cidr in self.cidrs]
 
         if None in subnets:
             self.fail("You have a VPC, but you're missing at least one subnet. Did you associate the subnets to your VPC?")
@@ -51,9 +55,3 @@ class MyChallenge(Challenge):
         self.success("You created a VPC with internet gateway and added subnets.")
 
 
-def subnet(client, vpc_id, cidr):
-    subnets = client.describe_subnets()["Subnets"]
-    for subnet in subnets:
-        if subnet["VpcId"] == vpc_id and subnet["CidrBlock"] == cidr:
-            return subnet
-
@@ -1,4 +1,4 @@
-import boto3
+from awslabs._awscache import cached_describe_all, filters, ttl_hash
 from awslabs.challenge import Challenge
 
 class MyChallenge(Challenge):
@@ -21,12 +21,13 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        client = boto3.client("ec2")
         vpc_id = self.get("vpc_id")
 
         subnet_ids = [self.get("subnet_id1"), self.get("subnet_id2")]
 
-        nat_gateways = [nat_gateway(client, vpc_id, subnet_id) for subnet_id in subnet_ids]
+        ngws = cached_describe_all('ec2', 'describe_nat_gateways', ttl_hash(),
+                                   filters({'vpc-id': [vpc_id], 'subnet-id': subnet_ids, 'state': ['available']}))["NatGateways"]
+        nat_gateways = [nat_gateway(ngws, vpc_id, subnet_id) for subnet_id in subnet_ids]
 
         if None in nat_gateways:
             self.fail("Could not find the NAT gateways associated with the public subnets.")
@@ -37,8 +38,7 @@ class MyChallenge(Challenge):
         self.success("You created a VPC, internet gateway, subnets and NAT gateways.")
 
 
-def nat_gateway(client, vpc_id, subnet_id):
-    ngws = client.describe_nat_gateways()["NatGateways"]
+def nat_gateway(ngws, vpc_id, subnet_id):
     for ngw in ngws:
         if ngw["State"] == "available" and ngw["VpcId"] == vpc_id and ngw["SubnetId"] == subnet_id:
             return ngw
@@ -1,4 +1,4 @@
-import boto3
+from awslabs._awscache import cached_describe_all, filters, ttl_hash
 from awslabs.challenge import Challenge
 
 
@@ -27,7 +27,6 @@ class MyChallenge(Challenge):
     description = __doc__
 
     def validate(self):
-        client = boto3.client("ec2")
         vpc_id = self.get("vpc_id")
         igw_id = self.get("igw_id")
         ngw_id1 = self.get("nat_gateway_id1")
@@ -35,7 +34,9 @@ class MyChallenge(Challenge):
 
         subnet_ids = [self.get("subnet_id{}".format(i)) for i in [1, 2, 3, 4]]
 
-        route_tables = [route_table(client, vpc_id, subnet_id) for subnet_id in subnet_ids]
+        rts = cached_describe_all('ec2', 'describe_route_tables', ttl_hash(),
+                                  filters({'vpc-id': [vpc_id], 'association.subnet-id': subnet_ids}))["RouteTables"]
+        route_tables = [route_table(rts, vpc_id, subnet_id) for subnet_id in subnet_ids]
 
         if None in route_tables:
             self.fail("Could not find all route tables. Are the route tables associated to their respective subnets?")
@@ -55,8 +56,7 @@ class MyChallenge(Challenge):
         self.success("Well done. You have configured a usable VPC.")
 
 
-def route_table(client, vpc_id, subnet_id):
-    rts = client.describe_route_tables()["RouteTables"]
+def route_table(rts, vpc_id, subnet_id):
     for rt in rts:
         if rt["VpcId"] == vpc_id and subnet_id in [a.get("SubnetId") for a in rt["Associations"]]:
             return rt
@@ -1,5 +1,5 @@
+from awslabs._awscache import cached_describe_all, filters, ttl_hash
 from awslabs.challenge import Challenge
-import boto3
 import os
 import click
 
@@ -38,15 +38,17 @@ class MyChallenge(Challenge):
         self.instructions()
 
     def validate(self):
-        client = boto3.client("ec2")
         vpc_id = self.get("vpc_id")
         subnet_id1 = self.get("subnet_id1")
         subnet_id2 = self.get("subnet_id2")
 
-        nacl = network_acl(client, vpc_id, subnet_id1)
+        nacls = cached_describe_all('ec2', 'describe_network_acls', ttl_hash(),
+                                    filters({'vpc-id': [vpc_id], 'association.subnet-id': [subnet_id1]}))["NetworkAcls"]
+        nacl = network_acl(nacls, vpc_id, subnet_id1)
+        if not nacl:
+            self.fail("No NACL is associated with the public subnets.")
 
-        nacl_subnet_ids = [n["SubnetId"] for n in nacl["Associations"]]
-        if subnet_id2 not in nacl_subnet_ids:
+        if subnet_id2 not in {n["SubnetId"] for n in nacl["Associations"]}:
             self.fail("Both public networks should be attached to the same NACL")
 
         nacl_entries = nacl["Entries"]
@@ -62,29 +64,40 @@ class MyChallenge(Challenge):
             if e["CidrBlock"] != "0.0.0.0/0":
                 self.fail("Expected CIDR block for all NACL's to be 0.0.0.0/0.")
 
-        if not nacl_entry(ingress, "allow", 80, 80):
+        entries = nacl_entry_index(nacl_entries)
+        if not nacl_entry(entries, False, "allow", 80, 80):
             self.fail("One ingress NACL should allow port 80.")
-        if not nacl_entry(ingress, "allow", 32768, 65535):
+        if not nacl_entry(entries, False, "allow", 32768, 65535):
             self.fail("One ingress NACL should allow ephemeral ports 32768-65535.")
-        if not nacl_entry(egress, "allow", 80, 80):
+        if not nacl_entry(entries, True, "allow", 80, 80):
             self.fail("One egress NACL should allow port 80.")
-        if not nacl_entry(egress, "allow", 32768, 65535):
+        if not nacl_entry(entries, True, "allow", 32768, 65535):
             self.fail("One egress NACL should allow ephemeral ports 32768-65535.")
 
         self.success("Almost there. Let's deploy a workload in the next step.")
 
 
-def network_acl(client, vpc_id, subnet_id):
-    nacls = client.describe_network_acls()["NetworkAcls"]
+def network_acl(nacls, vpc_id, subnet_id):
+    by_subnet = {}
     for nacl in nacls:
-        if vpc_id == nacl["VpcId"] and subnet_id in (n["SubnetId"] for n in nacl["Associations"]):
-            return nacl
+        if nacl["VpcId"] == vpc_id:
+            for association in nacl["Associations"]:
+                by_subnet.setdefault(association["SubnetId"], nacl)
+    return by_subnet.get(subnet_id)
 
 
-def nacl_entry(entries, action, from_port, to_port):
-    try:
-        return [e for e in entries if e["RuleAction"] == action \
-            and e["PortRange"]["From"] == from_port \
-            and e["PortRange"]["To"] == to_port][0]
-    except IndexError:
-        return None
+def nacl_entry_index(entries):
+    """
+    maps (egress, action, from port, to port) to the first matching entry;
+    entries without a port range (e.g. the default deny) are left out
+    """
+    index = {}
+    for e in entries:
+        if "PortRange" in e:
+            key = (e["Egress"], e["RuleAction"], e["PortRange"]["From"], e["PortRange"]["To"])
+            index.setdefault(key, e)
+    return index
+
+
+def nacl_entry(index, egress, action, from_port, to_port):
+    return index.get((egress, action, from_port, to_port))
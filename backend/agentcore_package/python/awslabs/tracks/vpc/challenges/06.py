@@ -1,13 +1,16 @@
+from awslabs._awscache import client
 from awslabs.challenge import Challenge
-import boto3
 import os
 import click
-from botocore.vendored import requests
+import requests
 from botocore.exceptions import ClientError
 
 
 STACK_NAME = "awslabs-vpc-test"
 
+# reused so repeated validations keep the connection to the instance
+_HTTP = requests.Session()
+
 
 class MyChallenge(Challenge):
     """
@@ -52,7 +55,7 @@ class MyChallenge(Challenge):
 
         ip = instance["PublicIpAddress"]
 
-        response = requests.get("http://{}".format(ip))
+        response = _HTTP.get("http://{}".format(ip), timeout=3)
 
         print (type(response.content))
         if "Amazon Linux AMI" not in str(response.content):
@@ -62,8 +65,8 @@ class MyChallenge(Challenge):
 
 
     def ec2_instance(self):
-        cfn = boto3.client("cloudformation")
-        ec2 = boto3.client("ec2")
+        cfn = client("cloudformation")
+        ec2 = client("ec2")
 
         try:
             resources = cfn.describe_stack_resources(StackName=STACK_NAME)["StackResources"]
@@ -1775,7 +1775,10 @@ class MemoryClient:
 
             if "namespaces" not in strategy_config:
                 strategy_type = StrategyType(strategy_type_key)
-                strategy_config["namespaces"] = DEFAULT_NAMESPACES.get(strategy_type, ["custom/{actorId}/{sessionId}"])
+                # copied so later edits to this strategy can't change the module default
+                strategy_config["namespaces"] = list(
+                    DEFAULT_NAMESPACES.get(strategy_type, ["custom/{actorId}/{sessionId}"])
+                )
 
             self._validate_strategy_config(strategy_copy, strategy_type_key)
 
@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
-class StrategyType(Enum):
+class StrategyType(str, Enum):
     """Memory strategy types."""
 
     SEMANTIC = "semanticMemoryStrategy"
@@ -16,7 +16,7 @@ class StrategyType(Enum):
     CUSTOM = "customMemoryStrategy"
 
 
-class MemoryStrategyTypeEnum(Enum):
+class MemoryStrategyTypeEnum(str, Enum):
     """Internal strategy type enum."""
 
     SEMANTIC = "SEMANTIC"
@@ -25,7 +25,7 @@ class MemoryStrategyTypeEnum(Enum):
     CUSTOM = "CUSTOM"
 
 
-class OverrideType(Enum):
+class OverrideType(str, Enum):
     """Custom strategy override types."""
 
     SEMANTIC_OVERRIDE = "SEMANTIC_OVERRIDE"
@@ -33,7 +33,7 @@ class OverrideType(Enum):
     USER_PREFERENCE_OVERRIDE = "USER_PREFERENCE_OVERRIDE"
 
 
-class MemoryStatus(Enum):
+class MemoryStatus(str, Enum):
     """Memory resource statuses."""
 
     CREATING = "CREATING"
@@ -43,7 +43,7 @@ class MemoryStatus(Enum):
     DELETING = "DELETING"
 
 
-class MemoryStrategyStatus(Enum):
+class MemoryStrategyStatus(str, Enum):
     """Memory strategy statuses (new from API update)."""
 
     CREATING = "CREATING"
@@ -52,14 +52,14 @@ class MemoryStrategyStatus(Enum):
     FAILED = "FAILED"
 
 
-class Role(Enum):
+class Role(str, Enum):
     """Conversation roles."""
 
     USER = "USER"
     ASSISTANT = "ASSISTANT"
 
 
-class MessageRole(Enum):
+class MessageRole(str, Enum):
     """Extended message roles including tool usage."""
 
     USER = "USER"
@@ -106,7 +106,7 @@ class ConfigLimits:
     MAX_HISTORICAL_CONTEXT_WINDOW = 12
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationalMessage:
     """Represents a conversational message with text and role.
 
@@ -126,7 +126,7 @@ class ConversationalMessage:
             raise ValueError("ConversationalMessage.role must be a MessageRole")
 
 
-@dataclass
+@dataclass(slots=True)
 class BlobMessage:
     """Represents a blob message containing arbitrary data.
 
@@ -1,22 +1,79 @@
 """Dictionary wrapper module for bedrock-agentcore memory models."""
 
-from typing import Any, Dict
+from __future__ import annotations
+
+from functools import lru_cache
+from sys import intern
+from types import MappingProxyType
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional, only used to speed up __repr__
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _reserved_names(cls: type) -> frozenset[str]:
+    """Names a data field must not shadow on instances of ``cls``."""
+    return frozenset(dir(cls)) | {"_data"}
 
 
 class DictWrapper:
-    """A wrapper class that provides dictionary-like access to data."""
+    """A wrapper class that provides dictionary-like access to data.
 
-    def __init__(self, data: Dict[str, Any]):
+    Attribute reads are snapshots: a field's value is stored on the instance
+    when it is first read (or at construction), so later changes to the
+    wrapped dict are only seen through ``[]``, ``get()`` and the views. Fields
+    that are absent read as None and are picked up once they are added.
+    """
+
+    def __init__(self, data: dict[str, Any]):
         """Initialize the DictWrapper with data.
 
         Args:
             data: Dictionary data to wrap
         """
         self._data = data
+        # Fields become plain instance attributes, read by the interpreter's own
+        # attribute lookup instead of __getattr__. Fields named like a class
+        # attribute (get, keys, ...) are only reachable through [] and get().
+        # Keys are interned: names in code are, and the specialized attribute
+        # lookup only hits when the instance dict holds that same string object.
+        self.__dict__.update({intern(k): v for k, v in data.items() if type(k) is str})
+        for name in _reserved_names(type(self)).intersection(data):
+            del self.__dict__[name]
 
     def __getattr__(self, name: str) -> Any:
-        """Provides direct access to data fields as attributes."""
-        return self._data.get(name)
+        """Provides direct access to data fields as attributes.
+
+        Only called on a lookup miss, i.e. for fields that are absent (None),
+        were added to the data after construction or were not copied because the
+        instance came from ``_fast``. A present value is then stored on the
+        instance so later reads of the same field are plain attribute lookups;
+        absent fields are not, so adding them later is still seen.
+        """
+        if name == "_data":
+            # not set yet (e.g. while copying or unpickling)
+            raise AttributeError(name)
+        data = self._data
+        if name not in data:
+            return None
+        value = self.__dict__[name] = data[name]
+        return value
+
+    @classmethod
+    def _fast(cls, data: dict[str, Any]) -> DictWrapper:
+        """Wrap a trusted SDK payload without running ``__init__``.
+
+        Nothing is copied up front: each field becomes an instance attribute on
+        its first read, through ``__getattr__``. Meant for bulk response pages,
+        where most fields of most records are never read; only for classes that
+        don't override ``__init__``.
+        """
+        obj = object.__new__(cls)
+        obj._data = data
+        return obj
 
     def __getitem__(self, key: str) -> Any:
         """Provides dictionary-style access to data fields."""
@@ -30,24 +87,41 @@ class DictWrapper:
         """Support 'in' operator for checking if key exists."""
         return key in self._data
 
+    def dict(self) -> MappingProxyType:
+        """Return a read-only view of the underlying dictionary.
+
+        The view is not a copy: it reflects the wrapped data as is. Use
+        ``dict(wrapper.dict())`` for an independent, mutable copy.
+        """
+        return MappingProxyType(self._data)
+
     def keys(self):
-        """Return keys from the underlying dictionary."""
+        """Return a view of the keys of the underlying dictionary."""
         return self._data.keys()
 
     def values(self):
-        """Return values from the underlying dictionary."""
+        """Return a view of the values of the underlying dictionary."""
         return self._data.values()
 
     def items(self):
-        """Return items from the underlying dictionary."""
+        """Return a view of the items of the underlying dictionary."""
         return self._data.items()
 
     def __dir__(self):
         """Enable tab completion and introspection of available attributes."""
-        return list(self._data.keys()) + ["get"]
+        return list(self._data.keys()) + ["get", "dict"]
 
     def __repr__(self):
-        """Return a JSON-formatted string representation of the data."""
+        """Return a JSON-formatted string representation of the data.
+
+        Uses orjson when it is installed; otherwise, or for data orjson cannot
+        encode, falls back to the dict repr.
+        """
+        if orjson is not None:
+            try:
+                return orjson.dumps(self._data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                pass
         return self._data.__repr__()
 
     def __str__(self):
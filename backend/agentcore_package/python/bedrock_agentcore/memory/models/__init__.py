@@ -1,7 +1,5 @@
 """Module containing all the model classes."""
 
-from typing import Any, Dict
-
 from .DictWrapper import DictWrapper
 from .filters import (
     EventMetadataFilter,
@@ -12,78 +10,42 @@ from .filters import (
     RightExpression,
     StringValue,
 )
+from .payloads import (
+    ActorSummaryPayload,
+    BranchPayload,
+    EventMessagePayload,
+    EventPayload,
+    MemoryRecordPayload,
+    SessionSummaryPayload,
+)
 
 
-class ActorSummary(DictWrapper):
-    """A class representing an actor summary."""
+# The models only differ in name and docstring; each wraps its payload as is,
+# through DictWrapper.__init__ (or DictWrapper._fast for bulk response pages).
 
-    def __init__(self, actor_summary: Dict[str, Any]):
-        """Initialize an ActorSummary instance.
 
-        Args:
-            actor_summary: Dictionary containing actor summary data.
-        """
-        super().__init__(actor_summary)
+class ActorSummary(DictWrapper):
+    """A class representing an actor summary (an ``ActorSummaryPayload``)."""
 
 
 class Branch(DictWrapper):
-    """A class representing a branch."""
-
-    def __init__(self, data: Dict[str, Any]):
-        """Initialize a Branch instance.
-
-        Args:
-            data: Dictionary containing branch data.
-        """
-        super().__init__(data)
+    """A class representing a branch (a ``BranchPayload``)."""
 
 
 class Event(DictWrapper):
-    """A class representing an event."""
-
-    def __init__(self, data: Dict[str, Any]):
-        """Initialize an Event instance.
-
-        Args:
-            data: Dictionary containing event data.
-        """
-        super().__init__(data)
+    """A class representing an event (an ``EventPayload``)."""
 
 
 class EventMessage(DictWrapper):
-    """A class representing an event message."""
-
-    def __init__(self, event_message: Dict[str, Any]):
-        """Initialize an EventMessage instance.
-
-        Args:
-            event_message: Dictionary containing event message data.
-        """
-        super().__init__(event_message)
+    """A class representing an event message (an ``EventMessagePayload``)."""
 
 
 class MemoryRecord(DictWrapper):
-    """A class representing a memory record."""
-
-    def __init__(self, memory_record: Dict[str, Any]):
-        """Initialize a MemoryRecord instance.
-
-        Args:
-            memory_record: Dictionary containing memory record data.
-        """
-        super().__init__(memory_record)
+    """A class representing a memory record (a ``MemoryRecordPayload``)."""
 
 
 class SessionSummary(DictWrapper):
-    """A class representing a session summary."""
-
-    def __init__(self, session_summary: Dict[str, Any]):
-        """Initialize a SessionSummary instance.
-
-        Args:
-            session_summary: Dictionary containing session summary data.
-        """
-        super().__init__(session_summary)
+    """A class representing a session summary (a ``SessionSummaryPayload``)."""
 
 
 __all__ = [
@@ -101,4 +63,10 @@ __all__ = [
     "OperatorType",
     "RightExpression",
     "EventMetadataFilter",
+    "ActorSummaryPayload",
+    "BranchPayload",
+    "EventPayload",
+    "EventMessagePayload",
+    "MemoryRecordPayload",
+    "SessionSummaryPayload",
 ]
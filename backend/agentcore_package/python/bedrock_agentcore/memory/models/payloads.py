@@ -0,0 +1,80 @@
+"""Typed shapes of the API payloads wrapped by the memory models.
+
+All shapes are ``total=False``: the service may omit optional members, and the
+SDK also wraps partial payloads (e.g. an empty event).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional, TypedDict
+
+from .filters import MetadataValue
+
+
+class ContentPayload(TypedDict, total=False):
+    """Text content of a conversational message or memory record."""
+
+    text: str
+
+
+class BranchRefPayload(TypedDict, total=False):
+    """Branch an event belongs to."""
+
+    name: str
+    rootEventId: str
+
+
+class ActorSummaryPayload(TypedDict, total=False):
+    """Payload of an ActorSummary."""
+
+    actorId: str
+
+
+class BranchPayload(TypedDict, total=False):
+    """Payload of a Branch, as assembled by MemorySessionManager.list_branches."""
+
+    name: str
+    rootEventId: Optional[str]
+    firstEventId: str
+    eventCount: int
+    created: datetime
+
+
+class EventPayload(TypedDict, total=False):
+    """Payload of an Event."""
+
+    memoryId: str
+    actorId: str
+    sessionId: str
+    eventId: str
+    eventTimestamp: datetime
+    payload: list[dict[str, Any]]
+    branch: BranchRefPayload
+    metadata: dict[str, MetadataValue]
+
+
+class EventMessagePayload(TypedDict, total=False):
+    """Payload of an EventMessage (the `conversational` member of an event payload item)."""
+
+    content: ContentPayload
+    role: str
+
+
+class MemoryRecordPayload(TypedDict, total=False):
+    """Payload of a MemoryRecord; `score` is only set on search results."""
+
+    memoryRecordId: str
+    content: ContentPayload
+    memoryStrategyId: str
+    namespaces: list[str]
+    createdAt: datetime
+    score: float
+
+
+class SessionSummaryPayload(TypedDict, total=False):
+    """Payload of a SessionSummary."""
+
+    sessionId: str
+    actorId: str
+    createdAt: datetime
@@ -305,10 +305,15 @@ class MemorySessionManager:
         retrieved_memories = []
         if retrieval_config:
             for namespace, config in retrieval_config.items():
-                resolved_namespace = namespace.format(
-                    actorId=actor_id,
-                    sessionId=session_id,
-                    strategyId=config.strategy_id or "",
+                # plain prefixes have nothing to substitute
+                resolved_namespace = (
+                    namespace.format(
+                        actorId=actor_id,
+                        sessionId=session_id,
+                        strategyId=config.strategy_id or "",
+                    )
+                    if "{" in namespace
+                    else namespace
                 )
                 search_query = f"{config.retrieval_query} {user_input}" if config.retrieval_query else user_input
                 memory_records = self.search_long_term_memories(
@@ -589,7 +594,7 @@ class MemorySessionManager:
                     logger.debug("No more events returned, ending pagination")
                     break
 
-                all_events.extend([Event(event) for event in events])
+                all_events.extend(map(Event._fast, events))
 
                 next_token = response.get("nextToken")
                 if not next_token or len(all_events) >= max_results:
@@ -686,7 +691,7 @@ class MemorySessionManager:
             result.extend(list(branches.values()))
 
             logger.info("Found %d branches in session %s", len(result), session_id)
-            return [Branch(branch) for branch in result]
+            return list(map(Branch._fast, result))
 
         except ClientError as e:
             logger.error("Failed to list branches: %s", e)
@@ -810,7 +815,7 @@ class MemorySessionManager:
             response = self._data_plane_client.retrieve_memory_records(**params)
             records = response.get("memoryRecordSummaries", [])
             logger.info("     ✅ Found %d relevant long-term records.", len(records))
-            return [MemoryRecord(record) for record in records]
+            return list(map(MemoryRecord._fast, records))
         except ClientError as e:
             logger.info("     ❌ Error querying long-term memory", e)
             raise
@@ -844,7 +849,7 @@ class MemorySessionManager:
                 if not memory_records:
                     memory_records = page.get("memoryRecordSummaries", [])
 
-                all_records.extend([MemoryRecord(record) for record in memory_records])
+                all_records.extend(map(MemoryRecord._fast, memory_records))
 
                 # Stop if we've reached max_results
                 if len(all_records) >= max_results:
@@ -869,7 +874,7 @@ class MemorySessionManager:
             all_actors = []
             for page in pages:
                 actor_summaries = page.get("actorSummaries", [])
-                all_actors.extend([ActorSummary(actor) for actor in actor_summaries])
+                all_actors.extend(map(ActorSummary._fast, actor_summaries))
             logger.info("  ✅ Found %d actors.", len(all_actors))
             return all_actors
         except ClientError as e:
@@ -916,7 +921,7 @@ class MemorySessionManager:
             all_sessions: List[SessionSummary] = []
             for page in pages:
                 response = page.get("sessionSummaries", [])
-                all_sessions.extend([SessionSummary(session) for session in response])
+                all_sessions.extend(map(SessionSummary._fast, response))
             logger.info("  ✅ Found %d sessions.", len(all_sessions))
             return all_sessions
         except ClientError as e:
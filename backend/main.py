@@ -185,19 +185,16 @@ Technical Requirements from RFx:
         
         agent = AWSArchitectureAgent()
         
-        # CRITICAL: Everything must happen INSIDE the MCP context
-        if agent.aws_docs_client and agent.aws_diag_client:
-            print("[INFO] Starting MCP client sessions...")
-            with agent.aws_docs_client, agent.aws_diag_client:
-                print("[INFO] MCP clients started, creating agent...")
-                agent.create_agent()  # Create agent INSIDE context - this calls list_tools_sync()
-                
-                print("[INFO] Running architecture generation...")
-                result = agent.run(
-                    technical_requirements=technical_requirements,
-                    parsed_key=parsed_s3_key,
-                    output_bucket="presales-rfp-outputs"
-                )
+        # MCP clients are process-wide: servers start on first tool call and
+        # stay up across requests (no per-request uvx spawn)
+        agent.create_agent()
+        
+        print("[INFO] Running architecture generation...")
+        result = agent.run(
+            technical_requirements=technical_requirements,
+            parsed_key=parsed_s3_key,
+            output_bucket="presales-rfp-outputs"
+        )
     
 
         # Extract user prefix from parsed key (e.g., "ravi" from "ravi/parsed_outputs/...")